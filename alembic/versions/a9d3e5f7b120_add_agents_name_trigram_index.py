@@ -0,0 +1,41 @@
+"""add agents name trigram index
+
+Revision ID: a9d3e5f7b120
+Revises: f2a8d1c6e304
+Create Date: 2025-04-23 15:48:21.602934
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d3e5f7b120"
+down_revision: Union[str, None] = "f2a8d1c6e304"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite databases are built from the models, not migrated
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Lets `name ILIKE '%...%'` searches use an index instead of scanning every agent
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_agents_name_trgm",
+        "agents",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index("ix_agents_name_trgm", table_name="agents", postgresql_using="gin")
@@ -1,5 +1,5 @@
 import uuid
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 
 import numpy as np
 import tiktoken
@@ -86,7 +86,7 @@ class EmbeddingEndpoint:
         self._base_url = base_url
         self._timeout = timeout
 
-    def _call_api(self, text: str) -> List[float]:
+    def _call_api(self, text: Union[str, List[str]]) -> Any:
         if not is_valid_url(self._base_url):
             raise ValueError(
                 f"Embeddings endpoint does not have a valid URL (set to: '{self._base_url}'). Make sure embedding_endpoint is set correctly in your Letta config."
@@ -104,7 +104,10 @@ class EmbeddingEndpoint:
                 timeout=self._timeout,
             )
 
-        response_json = response.json()
+        return response.json()
+
+    def get_text_embedding(self, text: str) -> List[float]:
+        response_json = self._call_api(text)
 
         if isinstance(response_json, list):
             # embedding directly in response
@@ -121,8 +124,26 @@ class EmbeddingEndpoint:
 
         return embedding
 
-    def get_text_embedding(self, text: str) -> List[float]:
-        return self._call_api(text)
+    def get_text_embedding_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts with a single request, returning the embeddings in input order"""
+        response_json = self._call_api(texts)
+
+        if isinstance(response_json, list):
+            # embeddings directly in response
+            embeddings = response_json
+        elif isinstance(response_json, dict):
+            # TEI embeddings packaged inside openai-style response
+            try:
+                embeddings = [d["embedding"] for d in sorted(response_json["data"], key=lambda d: d["index"])]
+            except (KeyError, TypeError):
+                raise TypeError(f"Got back an unexpected payload from text embedding function, response=\n{response_json}")
+        else:
+            # unknown response, can't parse
+            raise TypeError(f"Got back an unexpected payload from text embedding function, response=\n{response_json}")
+
+        if len(embeddings) != len(texts):
+            raise TypeError(f"Expected {len(texts)} embeddings from text embedding function, got {len(embeddings)}")
+        return embeddings
 
 
 class AzureOpenAIEmbedding:
@@ -136,6 +157,10 @@ class AzureOpenAIEmbedding:
         embeddings = self.client.embeddings.create(input=[text], model=self.model).data[0].embedding
         return embeddings
 
+    def get_text_embedding_batch(self, texts: List[str]) -> List[List[float]]:
+        response = self.client.embeddings.create(input=texts, model=self.model)
+        return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
 
 class OllamaEmbeddings:
 
@@ -167,6 +192,10 @@ class OllamaEmbeddings:
         response_json = response.json()
         return response_json["embedding"]
 
+    def get_text_embedding_batch(self, texts: List[str]) -> List[List[float]]:
+        # the /api/embeddings endpoint takes a single prompt
+        return [self.get_text_embedding(text) for text in texts]
+
 
 class GoogleEmbeddings:
     def __init__(self, api_key: str, model: str, base_url: str):
@@ -188,6 +217,10 @@ class GoogleEmbeddings:
         response_json = response.json()
         return response_json["embedding"]["values"]
 
+    def get_text_embedding_batch(self, texts: List[str]) -> List[List[float]]:
+        # embedContent takes a single piece of content
+        return [self.get_text_embedding(text) for text in texts]
+
 
 class GoogleVertexEmbeddings:
 
@@ -201,6 +234,9 @@ class GoogleVertexEmbeddings:
         response = self.client.generate_embeddings(content=text, model=self.model)
         return response.embeddings[0].embedding
 
+    def get_text_embedding_batch(self, texts: List[str]) -> List[List[float]]:
+        return [self.get_text_embedding(text) for text in texts]
+
 
 class OpenAIEmbeddings:
 
@@ -216,6 +252,10 @@ class OpenAIEmbeddings:
 
         return response.data[0].embedding
 
+    def get_text_embedding_batch(self, texts: List[str]) -> List[List[float]]:
+        response = self.client.embeddings.create(input=texts, model=self.model)
+        return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
 
 def query_embedding(embedding_model, query_text: str):
     """Generate padded embedding for querying database"""
@@ -1,5 +1,7 @@
+import copy
 import importlib
 import inspect
+from functools import lru_cache
 from textwrap import dedent  # remove indentation
 from types import ModuleType
 from typing import Dict, List, Optional
@@ -14,6 +16,12 @@ def derive_openai_json_schema(source_code: str, name: Optional[str] = None) -> d
     First, attempts to execute the source code in a custom environment with only the necessary imports.
     Then, it generates the schema from the function's docstring and signature.
     """
+    # The derivation only depends on its arguments, so it is memoized; callers get their own copy to mutate
+    return copy.deepcopy(_derive_openai_json_schema(source_code, name))
+
+
+@lru_cache(maxsize=256)
+def _derive_openai_json_schema(source_code: str, name: Optional[str] = None) -> dict:
     try:
         # Define a custom environment with necessary imports
         env = {
@@ -59,6 +67,7 @@ def derive_openai_json_schema(source_code: str, name: Optional[str] = None) -> d
         raise LettaToolCreateError(f"Schema generation failed: {str(e)}") from e
 
 
+@lru_cache(maxsize=None)
 def parse_source_code(func) -> str:
     """Parse the source code of a function and remove indendation"""
     source_code = dedent(inspect.getsource(func))
@@ -107,6 +116,12 @@ def get_json_schema_from_module(module_name: str, function_name: str) -> dict:
         AttributeError: If the function is not found in the module.
         ValueError: If the attribute is not a user-defined function.
     """
+    # Schemas of the built-in tool modules don't change at runtime, so they are memoized; callers get their own copy
+    return copy.deepcopy(_get_json_schema_from_module(module_name, function_name))
+
+
+@lru_cache(maxsize=None)
+def _get_json_schema_from_module(module_name: str, function_name: str) -> dict:
     try:
         # Dynamically import the module
         module = importlib.import_module(module_name)
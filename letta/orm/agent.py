@@ -28,7 +28,12 @@ if TYPE_CHECKING:
 class Agent(SqlalchemyBase, OrganizationMixin):
     __tablename__ = "agents"
     __pydantic_model__ = PydanticAgentState
-    __table_args__ = (Index("ix_agents_created_at", "created_at", "id"),)
+    __table_args__ = (
+        Index("ix_agents_created_at", "created_at", "id"),
+        Index("ix_agents_organization_id_created_at_id", "organization_id", "created_at", "id"),
+        # Postgres also has a pg_trgm GIN index on name (ix_agents_name_trgm) for `query_text` ILIKE searches.
+        # It is created by migration only, since create_all cannot assume the extension is installed.
+    )
 
     # agent generates its own id
     # TODO: We want to migrate all the ORM models to do this, so we will need to move this to the SqlalchemyBase
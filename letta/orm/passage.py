@@ -43,13 +43,13 @@ class BasePassage(SqlalchemyBase, OrganizationMixin):
 
     @declared_attr
     def __table_args__(cls):
+        indexes = [Index(f"{cls.__tablename__}_created_at_id_idx", "created_at", "id")]
+        if issubclass(cls, AgentMixin):
+            # Keyset pagination over a single agent's passages: equality on agent_id, then walk (created_at, id)
+            indexes.append(Index(f"{cls.__tablename__}_agent_created_at_id_idx", "agent_id", "created_at", "id"))
         if settings.letta_pg_uri_no_default:
-            return (
-                Index(f"{cls.__tablename__}_org_idx", "organization_id"),
-                Index(f"{cls.__tablename__}_created_at_id_idx", "created_at", "id"),
-                {"extend_existing": True},
-            )
-        return (Index(f"{cls.__tablename__}_created_at_id_idx", "created_at", "id"), {"extend_existing": True})
+            indexes.insert(0, Index(f"{cls.__tablename__}_org_idx", "organization_id"))
+        return (*indexes, {"extend_existing": True})
 
 
 class SourcePassage(BasePassage, FileMixin, SourceMixin):
@@ -36,7 +36,12 @@ class Source(SqlalchemyBase, OrganizationMixin):
     # relationships
     organization: Mapped["Organization"] = relationship("Organization", back_populates="sources")
     files: Mapped[List["FileMetadata"]] = relationship("FileMetadata", back_populates="source", cascade="all, delete-orphan")
-    passages: Mapped[List["SourcePassage"]] = relationship("SourcePassage", back_populates="source", cascade="all, delete-orphan")
+    passages: Mapped[List["SourcePassage"]] = relationship(
+        "SourcePassage",
+        back_populates="source",
+        cascade="all, delete-orphan",
+        passive_deletes=True,  # Passages are removed set-wise (FK ON DELETE CASCADE / SourceManager.delete_source), never loaded to be deleted
+    )
     agents: Mapped[List["Agent"]] = relationship(
         "Agent",
         secondary="sources_agents",
@@ -990,18 +990,15 @@ class SyncServer(Server):
         num_passages, num_documents = self.load_data(user_id=source.created_by_id, source_name=source.name, connector=connector)
 
         # update all agents who have this source attached
-        agent_states = self.source_manager.list_attached_agents(source_id=source_id, actor=actor)
-        for agent_state in agent_states:
-            agent_id = agent_state.id
-
+        for agent_id in self.source_manager.list_attached_agent_ids(source_id=source_id, actor=actor):
             # Attach source to agent
             curr_passage_size = self.agent_manager.passage_size(actor=actor, agent_id=agent_id)
-            agent_state = self.agent_manager.attach_source(agent_id=agent_state.id, source_id=source_id, actor=actor)
+            self.agent_manager.attach_source(agent_id=agent_id, source_id=source_id, actor=actor)
             new_passage_size = self.agent_manager.passage_size(actor=actor, agent_id=agent_id)
             assert new_passage_size >= curr_passage_size  # in case empty files are added
 
             # rebuild system prompt and force
-            agent_state = self.agent_manager.rebuild_system_prompt(agent_id=agent_id, actor=actor, force=True)
+            self.agent_manager.rebuild_system_prompt(agent_id=agent_id, actor=actor, force=True)
 
         # update job status
         job.status = JobStatus.completed
@@ -2,7 +2,8 @@ from datetime import datetime
 from typing import Dict, List, Optional
 
 import numpy as np
-from sqlalchemy import Select, and_, func, literal, or_, select, union_all
+from sqlalchemy import Select, and_, case, func, insert, literal, or_, select, union_all
+from sqlalchemy.orm import Session, lazyload
 
 from letta.constants import (
     BASE_MEMORY_TOOLS,
@@ -19,13 +20,15 @@ from letta.log import get_logger
 from letta.orm import Agent as AgentModel
 from letta.orm import AgentPassage, AgentsTags
 from letta.orm import Block as BlockModel
+from letta.orm import BlocksAgents
 from letta.orm import Group as GroupModel
 from letta.orm import Identity as IdentityModel
 from letta.orm import Source as SourceModel
 from letta.orm import SourcePassage, SourcesAgents
 from letta.orm import Tool as ToolModel
+from letta.orm import ToolsAgents
 from letta.orm.enums import ToolType
-from letta.orm.errors import NoResultFound
+from letta.orm.errors import NoResultFound, UniqueConstraintViolationError
 from letta.orm.sandbox_config import AgentEnvironmentVariable as AgentEnvironmentVariableModel
 from letta.orm.sqlalchemy_base import AccessType
 from letta.orm.sqlite_functions import adapt_array
@@ -56,7 +59,9 @@ from letta.services.helpers.agent_manager_helper import (
     _apply_filters,
     _apply_identity_filters,
     _apply_pagination,
+    _apply_relationship_loaders,
     _apply_tag_filter,
+    _attach_relationship,
     _process_relationship,
     _process_tags,
     check_supports_structured_output,
@@ -102,6 +107,67 @@ class AgentManager:
         agent_create: CreateAgent,
         actor: PydanticUser,
     ) -> PydanticAgentState:
+        agent_kwargs = self._resolve_agent_create(agent_create, actor=actor)
+
+        # Create the agent
+        with self.session_maker() as session:
+            new_agent = self._build_agent(session, actor=actor, **agent_kwargs)
+            new_agent.create(session, actor=actor)
+            agent_state = new_agent.to_pydantic()
+
+        # If there are provided environment variables, add them in
+        if agent_create.tool_exec_environment_variables:
+            agent_state = self._set_environment_variables(
+                agent_id=agent_state.id,
+                env_vars=agent_create.tool_exec_environment_variables,
+                actor=actor,
+            )
+
+        return self.append_initial_message_sequence_to_in_context_messages(actor, agent_state, agent_create.initial_message_sequence)
+
+    @trace_method
+    @enforce_types
+    def create_many_agents(self, agent_creates: List[CreateAgent], actor: PydanticUser) -> List[PydanticAgentState]:
+        """Create multiple agents, batching the agent rows and their initial messages, preserving the input order."""
+        if not agent_creates:
+            return []
+
+        agent_kwargs = [self._resolve_agent_create(agent_create, actor=actor) for agent_create in agent_creates]
+
+        # Insert every agent row in a single transaction
+        with self.session_maker() as session:
+            new_agents = [self._build_agent(session, actor=actor, **kwargs) for kwargs in agent_kwargs]
+            created = {agent.id: agent.to_pydantic() for agent in AgentModel.batch_create(new_agents, session, actor=actor)}
+            agent_states = [created[agent.id] for agent in new_agents]
+
+        for i, agent_create in enumerate(agent_creates):
+            if agent_create.tool_exec_environment_variables:
+                agent_states[i] = self._set_environment_variables(
+                    agent_id=agent_states[i].id,
+                    env_vars=agent_create.tool_exec_environment_variables,
+                    actor=actor,
+                )
+
+        # Write all initial message sequences in one batch, then point each agent at its own messages
+        init_messages = {
+            agent_state.id: self._build_initial_message_sequence(actor, agent_state, agent_create.initial_message_sequence)
+            for agent_state, agent_create in zip(agent_states, agent_creates)
+        }
+        self.message_manager.create_many_messages([message for messages in init_messages.values() for message in messages], actor=actor)
+
+        with self.session_maker() as session:
+            agents = {agent.id: agent for agent in session.execute(select(AgentModel).where(AgentModel.id.in_(init_messages))).scalars()}
+            for agent_id, messages in init_messages.items():
+                agents[agent_id].message_ids = [message.id for message in messages]
+                agents[agent_id].set_updated_at()
+            session.flush()
+            agent_states = [agents[agent_state.id].to_pydantic() for agent_state in agent_states]
+            session.commit()
+            return agent_states
+
+    @enforce_types
+    def _resolve_agent_create(self, agent_create: CreateAgent, actor: PydanticUser) -> Dict:
+        """Create the agent's memory blocks and resolve its system prompt, tools and tool rules into `_build_agent` arguments."""
         system = derive_system_message(
             agent_type=agent_create.agent_type,
             enable_sleeptime=agent_create.enable_sleeptime,
@@ -114,9 +180,10 @@ class AgentManager:
         # create blocks (note: cannot be linked into the agent_id is created)
         block_ids = list(agent_create.block_ids or [])  # Create a local copy to avoid modifying the original
         if agent_create.memory_blocks:
-            for create_block in agent_create.memory_blocks:
-                block = self.block_manager.create_or_update_block(PydanticBlock(**create_block.model_dump(to_orm=True)), actor=actor)
-                block_ids.append(block.id)
+            blocks = self.block_manager.create_many_blocks(
+                [PydanticBlock(**create_block.model_dump(to_orm=True)) for create_block in agent_create.memory_blocks], actor=actor
+            )
+            block_ids.extend(block.id for block in blocks)
 
         # add passed in `tools`
         tool_names = agent_create.tools or []
@@ -168,8 +235,7 @@ class AgentManager:
         if agent_create.tool_rules:
             check_supports_structured_output(model=agent_create.llm_config.model, tool_rules=agent_create.tool_rules)
 
-        # Create the agent
-        agent_state = self._create_agent(
+        return dict(
             name=agent_create.name,
             system=system,
             agent_type=agent_create.agent_type,
@@ -183,28 +249,24 @@ class AgentManager:
             description=agent_create.description,
             metadata=agent_create.metadata,
             tool_rules=tool_rules,
-            actor=actor,
             project_id=agent_create.project_id,
             template_id=agent_create.template_id,
             base_template_id=agent_create.base_template_id,
             message_buffer_autoclear=agent_create.message_buffer_autoclear,
             enable_sleeptime=agent_create.enable_sleeptime,
+            created_at=agent_create.created_at,
         )
 
-        # If there are provided environment variables, add them in
-        if agent_create.tool_exec_environment_variables:
-            agent_state = self._set_environment_variables(
-                agent_id=agent_state.id,
-                env_vars=agent_create.tool_exec_environment_variables,
-                actor=actor,
-            )
-
-        return self.append_initial_message_sequence_to_in_context_messages(actor, agent_state, agent_create.initial_message_sequence)
-
     @enforce_types
     def append_initial_message_sequence_to_in_context_messages(
         self, actor: PydanticUser, agent_state: PydanticAgentState, initial_message_sequence: Optional[List[MessageCreate]] = None
     ) -> PydanticAgentState:
+        init_messages = self._build_initial_message_sequence(actor, agent_state, initial_message_sequence)
+        return self.append_to_in_context_messages(init_messages, agent_id=agent_state.id, actor=actor)
+
+    def _build_initial_message_sequence(
+        self, actor: PydanticUser, agent_state: PydanticAgentState, initial_message_sequence: Optional[List[MessageCreate]] = None
+    ) -> List[PydanticMessage]:
         init_messages = initialize_message_sequence(
             agent_state=agent_state, memory_edit_timestamp=get_utc_time(), include_initial_boot_message=True
         )
@@ -227,11 +289,12 @@ class AgentManager:
                 for msg in init_messages
             ]
 
-        return self.append_to_in_context_messages(init_messages, agent_id=agent_state.id, actor=actor)
+        return init_messages
 
     @enforce_types
-    def _create_agent(
+    def _build_agent(
         self,
+        session: Session,
         actor: PydanticUser,
         name: str,
         system: str,
@@ -251,39 +314,39 @@ class AgentManager:
         base_template_id: Optional[str] = None,
         message_buffer_autoclear: bool = False,
         enable_sleeptime: Optional[bool] = None,
-    ) -> PydanticAgentState:
-        """Create a new agent."""
-        with self.session_maker() as session:
-            # Prepare the agent data
-            data = {
-                "name": name,
-                "system": system,
-                "agent_type": agent_type,
-                "llm_config": llm_config,
-                "embedding_config": embedding_config,
-                "organization_id": actor.organization_id,
-                "description": description,
-                "metadata_": metadata,
-                "tool_rules": tool_rules,
-                "project_id": project_id,
-                "template_id": template_id,
-                "base_template_id": base_template_id,
-                "message_buffer_autoclear": message_buffer_autoclear,
-                "enable_sleeptime": enable_sleeptime,
-            }
-
-            # Create the new agent using SqlalchemyBase.create
-            new_agent = AgentModel(**data)
-            _process_relationship(session, new_agent, "tools", ToolModel, tool_ids, replace=True)
-            _process_relationship(session, new_agent, "sources", SourceModel, source_ids, replace=True)
-            _process_relationship(session, new_agent, "core_memory", BlockModel, block_ids, replace=True)
-            _process_tags(new_agent, tags, replace=True)
-            _process_relationship(session, new_agent, "identities", IdentityModel, identity_ids, replace=True)
-
-            new_agent.create(session, actor=actor)
-
-            # Convert to PydanticAgentState and return
-            return new_agent.to_pydantic()
+        created_at: Optional[datetime] = None,
+    ) -> AgentModel:
+        """Build a new, unsaved agent with its relationships attached."""
+        # Prepare the agent data
+        data = {
+            "name": name,
+            "system": system,
+            "agent_type": agent_type,
+            "llm_config": llm_config,
+            "embedding_config": embedding_config,
+            "organization_id": actor.organization_id,
+            "description": description,
+            "metadata_": metadata,
+            "tool_rules": tool_rules,
+            "project_id": project_id,
+            "template_id": template_id,
+            "base_template_id": base_template_id,
+            "message_buffer_autoclear": message_buffer_autoclear,
+            "enable_sleeptime": enable_sleeptime,
+        }
+        # Only override the server default when a timestamp is given, e.g. to pin ordering
+        if created_at is not None:
+            data["created_at"] = created_at
+
+        # Create the new agent using SqlalchemyBase.create
+        new_agent = AgentModel(**data)
+        _process_relationship(session, new_agent, "tools", ToolModel, tool_ids, replace=True)
+        _process_relationship(session, new_agent, "sources", SourceModel, source_ids, replace=True)
+        _process_relationship(session, new_agent, "core_memory", BlockModel, block_ids, replace=True)
+        _process_tags(new_agent, tags, replace=True)
+        _process_relationship(session, new_agent, "identities", IdentityModel, identity_ids, replace=True)
+
+        return new_agent
 
     @enforce_types
     def update_agent(self, agent_id: str, agent_update: UpdateAgent, actor: PydanticUser) -> PydanticAgentState:
@@ -395,8 +458,8 @@ class AgentManager:
             name (Optional[str]): Filter by agent name.
             tags (Optional[List[str]]): Filter agents by tags.
             match_all_tags (bool): If True, only return agents that match ALL given tags.
-            before (Optional[str]): Cursor for pagination.
-            after (Optional[str]): Cursor for pagination.
+            before (Optional[str]): Cursor for pagination, either an agent ID or a cursor from `encode_agent_cursor`.
+            after (Optional[str]): Cursor for pagination, either an agent ID or a cursor from `encode_agent_cursor`.
             limit (Optional[int]): Maximum number of agents to return.
             query_text (Optional[str]): Search agents by name.
             project_id (Optional[str]): Filter by project ID.
@@ -409,6 +472,10 @@ class AgentManager:
 
         Returns:
             List[PydanticAgentState]: The filtered list of matching agents.
+
+        Raises:
+            ValueError: If `before` or `after` is neither an agent ID nor a cursor from `encode_agent_cursor`.
+            NoResultFound: If `before` or `after` is an agent ID that does not exist.
         """
         with self.session_maker() as session:
             query = select(AgentModel).distinct(AgentModel.created_at, AgentModel.id)
@@ -419,6 +486,7 @@ class AgentManager:
             query = _apply_identity_filters(query, identity_id, identifier_keys)
             query = _apply_tag_filter(query, tags, match_all_tags)
             query = _apply_pagination(query, before, after, session, ascending=ascending)
+            query = _apply_relationship_loaders(query, include_relationships)
 
             if limit:
                 query = query.limit(limit)
@@ -451,21 +519,17 @@ class AgentManager:
         with self.session_maker() as session:
             query = select(AgentModel).where(AgentModel.organization_id == actor.organization_id)
 
-            if match_all:
-                # Subquery to find agent IDs that contain all match_all tags
-                subquery = (
-                    select(AgentsTags.agent_id)
-                    .where(AgentsTags.tag.in_(match_all))
-                    .group_by(AgentsTags.agent_id)
-                    .having(func.count(AgentsTags.tag) == literal(len(match_all)))
-                )
+            if match_all or match_some:
+                # One pass over the matching tag rows, counting the match_all and match_some hits per agent
+                match_all, match_some = set(match_all), set(match_some)
+                subquery = select(AgentsTags.agent_id).where(AgentsTags.tag.in_(match_all | match_some)).group_by(AgentsTags.agent_id)
+                if match_all:
+                    subquery = subquery.having(func.count(case((AgentsTags.tag.in_(match_all), 1))) == literal(len(match_all)))
+                if match_some:
+                    subquery = subquery.having(func.count(case((AgentsTags.tag.in_(match_some), 1))) >= literal(1))
                 query = query.where(AgentModel.id.in_(subquery))
 
-            if match_some:
-                # Ensures agents match at least one tag in match_some
-                query = query.join(AgentsTags).where(AgentsTags.tag.in_(match_some))
-
-            query = query.distinct(AgentModel.id).order_by(AgentModel.id).limit(limit)
+            query = query.order_by(AgentModel.id).limit(limit)
 
             return list(session.execute(query).scalars())
 
@@ -899,16 +963,8 @@ class AgentManager:
             # Verify both agent and source exist and user has permission to access them
             agent = AgentModel.read(db_session=session, identifier=agent_id, actor=actor)
 
-            # The _process_relationship helper already handles duplicate checking via unique constraint
-            _process_relationship(
-                session=session,
-                agent=agent,
-                relationship_name="sources",
-                model_class=SourceModel,
-                item_ids=[source_id],
-                allow_partial=False,
-                replace=False,  # Extend existing sources rather than replace
-            )
+            # Link the source; attaching an already attached source is a no-op
+            _attach_relationship(session, SourcesAgents, "source_id", SourceModel, agent_id=agent.id, item_id=source_id)
 
             # Commit the changes
             agent.update(session, actor=actor)
@@ -937,9 +993,9 @@ class AgentManager:
         self.append_to_in_context_messages(messages=[message], agent_id=agent_id, actor=actor)
 
     @enforce_types
-    def list_attached_sources(self, agent_id: str, actor: PydanticUser) -> List[PydanticSource]:
+    def list_attached_source_ids(self, agent_id: str, actor: PydanticUser) -> List[str]:
         """
-        Lists all sources attached to an agent.
+        Lists the IDs of all sources attached to an agent, without loading the agent or the sources.
 
         Args:
             agent_id: ID of the agent to list sources for
@@ -947,13 +1003,43 @@ class AgentManager:
 
         Returns:
             List[str]: List of source IDs attached to the agent
+
+        Raises:
+            NoResultFound: If the agent doesn't exist or the actor can't access it
         """
         with self.session_maker() as session:
-            # Verify agent exists and user has permission to access it
-            agent = AgentModel.read(db_session=session, identifier=agent_id, actor=actor)
+            # Outer join so an accessible agent without sources still yields a row
+            query = (
+                select(AgentModel.id, SourcesAgents.source_id)
+                .outerjoin(SourcesAgents, SourcesAgents.agent_id == AgentModel.id)
+                .where(AgentModel.id == agent_id)
+            )
+            query = AgentModel.apply_access_predicate(query, actor, ["read"], AccessType.ORGANIZATION)
+            rows = session.execute(query).all()
+            if not rows:
+                raise NoResultFound(f"Agent with id {agent_id} not found")
+            return [source_id for _, source_id in rows if source_id is not None]
 
-            # Use the lazy-loaded relationship to get sources
-            return [source.to_pydantic() for source in agent.sources]
+    @enforce_types
+    def list_attached_sources(self, agent_id: str, actor: PydanticUser) -> List[PydanticSource]:
+        """
+        Lists all sources attached to an agent.
+
+        Args:
+            agent_id: ID of the agent to list sources for
+            actor: User performing the action
+
+        Returns:
+            List[PydanticSource]: List of sources attached to the agent
+        """
+        source_ids = self.list_attached_source_ids(agent_id=agent_id, actor=actor)
+        if not source_ids:
+            return []
+
+        with self.session_maker() as session:
+            # Sources' own agents relationship is not part of the pydantic model, so skip loading it
+            query = select(SourceModel).where(SourceModel.id.in_(source_ids)).options(lazyload(SourceModel.agents))
+            return [source.to_pydantic() for source in session.execute(query).scalars()]
 
     @enforce_types
     def detach_source(self, agent_id: str, source_id: str, actor: PydanticUser) -> PydanticAgentState:
@@ -993,12 +1079,47 @@ class AgentManager:
         actor: PydanticUser,
     ) -> PydanticBlock:
         """Gets a block attached to an agent by its label."""
-        with self.session_maker() as session:
-            agent = AgentModel.read(db_session=session, identifier=agent_id, actor=actor)
-            for block in agent.core_memory:
-                if block.label == block_label:
-                    return block.to_pydantic()
+        block = self._read_attached_block(agent_id, actor, BlockModel.label == block_label)
+        if block is None:
             raise NoResultFound(f"No block with label '{block_label}' found for agent '{agent_id}'")
+        return block
+
+    @enforce_types
+    def has_block(self, agent_id: str, block_id: str, actor: PydanticUser) -> bool:
+        """Checks whether a block is attached to an agent with a single EXISTS probe on blocks_agents."""
+        with self.session_maker() as session:
+            query = (
+                select(BlocksAgents.agent_id)
+                .join(AgentModel, AgentModel.id == BlocksAgents.agent_id)
+                .where(BlocksAgents.agent_id == agent_id, BlocksAgents.block_id == block_id)
+            )
+            query = AgentModel.apply_access_predicate(query, actor, ["read"], AccessType.ORGANIZATION)
+            return session.scalar(select(query.exists()))
+
+    @enforce_types
+    def get_block_on_agent(self, agent_id: str, block_id: str, actor: PydanticUser) -> PydanticBlock:
+        """Gets a block by ID, provided it is attached to the agent."""
+        block = self._read_attached_block(agent_id, actor, BlocksAgents.block_id == block_id)
+        if block is None:
+            raise NoResultFound(f"No block with id '{block_id}' found for agent '{agent_id}'")
+        return block
+
+    def _read_attached_block(self, agent_id: str, actor: PydanticUser, *criteria) -> Optional[PydanticBlock]:
+        """
+        Reads a single block attached to an agent straight through blocks_agents, without loading the agent's object
+        graph or the block's own agents/identities/groups.
+        """
+        with self.session_maker() as session:
+            query = (
+                select(BlockModel)
+                .join(BlocksAgents, BlocksAgents.block_id == BlockModel.id)
+                .join(AgentModel, AgentModel.id == BlocksAgents.agent_id)
+                .where(BlocksAgents.agent_id == agent_id, BlockModel.is_deleted == False, *criteria)
+                .options(lazyload(BlockModel.agents), lazyload(BlockModel.identities), lazyload(BlockModel.groups))
+            )
+            query = AgentModel.apply_access_predicate(query, actor, ["read"], AccessType.ORGANIZATION)
+            block = session.scalars(query).first()
+            return block.to_pydantic() if block else None
 
     @enforce_types
     def update_block_with_label(
@@ -1026,15 +1147,87 @@ class AgentManager:
 
     @enforce_types
     def attach_block(self, agent_id: str, block_id: str, actor: PydanticUser) -> PydanticAgentState:
-        """Attaches a block to an agent."""
+        """
+        Attaches a block to an agent.
+
+        Raises:
+            NoResultFound: If the agent or the block doesn't exist or the actor can't access it
+            UniqueConstraintViolationError: If the agent already has the block or a block with its label
+        """
         with self.session_maker() as session:
             agent = AgentModel.read(db_session=session, identifier=agent_id, actor=actor)
-            block = BlockModel.read(db_session=session, identifier=block_id, actor=actor)
 
-            agent.core_memory.append(block)
+            # Link the block with one INSERT ... SELECT that reads its label on the way in, rather than loading the
+            # block (and, through its relationships, every agent it is attached to) just to append it. Rows that would
+            # conflict are skipped instead of relying on the INSERT's IntegrityError, which the SQLite engine wrapper
+            # doesn't let through.
+            conflicting_link = select(BlocksAgents.agent_id).where(
+                BlocksAgents.agent_id == agent.id,
+                or_(BlocksAgents.block_id == BlockModel.id, BlocksAgents.block_label == BlockModel.label),
+            )
+            block_row_select = select(literal(agent.id), BlockModel.id, BlockModel.label).where(
+                BlockModel.id == block_id, ~conflicting_link.exists()
+            )
+            block_row_select = BlockModel.apply_access_predicate(block_row_select, actor, ["read"], AccessType.ORGANIZATION)
+            stmt = insert(BlocksAgents).from_select(["agent_id", "block_id", "block_label"], block_row_select)
+            if session.execute(stmt).rowcount == 0:
+                # Nothing was linked: either the block is missing (read raises NoResultFound) or it would conflict
+                block = BlockModel.read(db_session=session, identifier=block_id, actor=actor)
+                raise UniqueConstraintViolationError(f"Agent {agent.id} already has block {block.id} or a block labeled '{block.label}'")
+
+            # Commit and refresh the agent
             agent.update(session, actor=actor)
             return agent.to_pydantic()
 
+    @enforce_types
+    def attach_block_to_agents(self, agent_ids: List[str], block_id: str, actor: PydanticUser) -> None:
+        """
+        Attaches a block to several agents with a single multi-row INSERT into blocks_agents.
+
+        The attachment is all-or-nothing: if the block is already attached to any of the agents (or one of them
+        already has a block with the same label) nothing is attached.
+
+        Args:
+            agent_ids: IDs of the agents to attach the block to
+            block_id: ID of the block to attach
+            actor: User performing the action
+
+        Raises:
+            NoResultFound: If the block or any of the agents doesn't exist or the actor can't access it
+            UniqueConstraintViolationError: If any of the agents already has the block or a block with its label
+        """
+        agent_ids = list(dict.fromkeys(agent_ids))
+        if not agent_ids:
+            return
+
+        with self.session_maker() as session:
+            block = BlockModel.read(db_session=session, identifier=block_id, actor=actor)
+
+            query = AgentModel.apply_access_predicate(
+                select(AgentModel.id).where(AgentModel.id.in_(agent_ids)), actor, ["write"], AccessType.ORGANIZATION
+            )
+            missing_ids = set(agent_ids) - set(session.scalars(query))
+            if missing_ids:
+                raise NoResultFound(f"Agents with ids {sorted(missing_ids)} not found")
+
+            # Check up front rather than relying on the INSERT's IntegrityError, which the SQLite engine wrapper doesn't let through
+            conflicting_ids = session.scalars(
+                select(BlocksAgents.agent_id).where(
+                    BlocksAgents.agent_id.in_(agent_ids),
+                    or_(BlocksAgents.block_id == block.id, BlocksAgents.block_label == block.label),
+                )
+            ).all()
+            if conflicting_ids:
+                raise UniqueConstraintViolationError(
+                    f"Agents with ids {sorted(set(conflicting_ids))} already have block {block.id} or a block labeled '{block.label}'"
+                )
+
+            session.execute(
+                insert(BlocksAgents),
+                [{"agent_id": agent_id, "block_id": block.id, "block_label": block.label} for agent_id in agent_ids],
+            )
+            session.commit()
+
     @enforce_types
     def detach_block(
         self,
@@ -1192,60 +1385,24 @@ class AgentManager:
                 if query_text:
                     main_query = main_query.where(func.lower(combined_query.c.text).contains(func.lower(query_text)))
 
-            # Handle pagination
-            if before or after:
-                # Create reference CTEs
-                if before:
-                    before_ref = (
-                        select(combined_query.c.created_at, combined_query.c.id).where(combined_query.c.id == before).cte("before_ref")
-                    )
-                if after:
-                    after_ref = (
-                        select(combined_query.c.created_at, combined_query.c.id).where(combined_query.c.id == after).cte("after_ref")
+            # Handle pagination: keyset on (created_at, id), with the cursor's keys read from the passage tables directly
+            # so the combined CTE is referenced once and the planner can push these predicates down into its branches
+            if before:
+                before_created_at, before_id = self._passage_cursor_keys(before, actor)
+                main_query = main_query.where(
+                    or_(
+                        combined_query.c.created_at < before_created_at,
+                        and_(combined_query.c.created_at == before_created_at, combined_query.c.id < before_id),
                     )
-
-                if before and after:
-                    # Window-based query (get records between before and after)
-                    main_query = main_query.where(
-                        or_(
-                            combined_query.c.created_at < select(before_ref.c.created_at).scalar_subquery(),
-                            and_(
-                                combined_query.c.created_at == select(before_ref.c.created_at).scalar_subquery(),
-                                combined_query.c.id < select(before_ref.c.id).scalar_subquery(),
-                            ),
-                        )
-                    )
-                    main_query = main_query.where(
-                        or_(
-                            combined_query.c.created_at > select(after_ref.c.created_at).scalar_subquery(),
-                            and_(
-                                combined_query.c.created_at == select(after_ref.c.created_at).scalar_subquery(),
-                                combined_query.c.id > select(after_ref.c.id).scalar_subquery(),
-                            ),
-                        )
+                )
+            if after:
+                after_created_at, after_id = self._passage_cursor_keys(after, actor)
+                main_query = main_query.where(
+                    or_(
+                        combined_query.c.created_at > after_created_at,
+                        and_(combined_query.c.created_at == after_created_at, combined_query.c.id > after_id),
                     )
-                else:
-                    # Pure pagination (only before or only after)
-                    if before:
-                        main_query = main_query.where(
-                            or_(
-                                combined_query.c.created_at < select(before_ref.c.created_at).scalar_subquery(),
-                                and_(
-                                    combined_query.c.created_at == select(before_ref.c.created_at).scalar_subquery(),
-                                    combined_query.c.id < select(before_ref.c.id).scalar_subquery(),
-                                ),
-                            )
-                        )
-                    if after:
-                        main_query = main_query.where(
-                            or_(
-                                combined_query.c.created_at > select(after_ref.c.created_at).scalar_subquery(),
-                                and_(
-                                    combined_query.c.created_at == select(after_ref.c.created_at).scalar_subquery(),
-                                    combined_query.c.id > select(after_ref.c.id).scalar_subquery(),
-                                ),
-                            )
-                        )
+                )
 
             # Add ordering if not already ordered by similarity
             if not embed_query:
@@ -1262,6 +1419,22 @@ class AgentManager:
 
         return main_query
 
+    @staticmethod
+    def _passage_cursor_keys(passage_id: str, actor: PydanticUser):
+        """
+        Returns scalar subqueries for the (created_at, id) of the passage used as a pagination cursor, looked up in
+        both passage tables within the actor's organization. An unknown cursor yields NULLs, so nothing matches.
+        """
+        cursor = union_all(
+            select(AgentPassage.created_at, AgentPassage.id).where(
+                AgentPassage.id == passage_id, AgentPassage.organization_id == actor.organization_id
+            ),
+            select(SourcePassage.created_at, SourcePassage.id).where(
+                SourcePassage.id == passage_id, SourcePassage.organization_id == actor.organization_id
+            ),
+        ).subquery()
+        return select(cursor.c.created_at).scalar_subquery(), select(cursor.c.id).scalar_subquery()
+
     @enforce_types
     def list_passages(
         self,
@@ -1383,16 +1556,8 @@ class AgentManager:
             # Verify the agent exists and user has permission to access it
             agent = AgentModel.read(db_session=session, identifier=agent_id, actor=actor)
 
-            # Use the _process_relationship helper to attach the tool
-            _process_relationship(
-                session=session,
-                agent=agent,
-                relationship_name="tools",
-                model_class=ToolModel,
-                item_ids=[tool_id],
-                allow_partial=False,  # Ensure the tool exists
-                replace=False,  # Extend the existing tools
-            )
+            # Link the tool; attaching an already attached tool is a no-op
+            _attach_relationship(session, ToolsAgents, "tool_id", ToolModel, agent_id=agent.id, item_id=tool_id)
 
             # Commit and refresh the agent
             agent.update(session, actor=actor)
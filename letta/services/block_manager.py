@@ -37,6 +37,19 @@ class BlockManager:
                 block.create(session, actor=actor)
             return block.to_pydantic()
 
+    @enforce_types
+    def create_many_blocks(self, blocks: List[PydanticBlock], actor: PydanticUser) -> List[PydanticBlock]:
+        """Create multiple new blocks in a single database transaction, preserving the input order."""
+        if not blocks:
+            return []
+
+        orm_blocks = [
+            BlockModel(**block.model_dump(to_orm=True, exclude_none=True), organization_id=actor.organization_id) for block in blocks
+        ]
+        with self.session_maker() as session:
+            created = {block.id: block.to_pydantic() for block in BlockModel.batch_create(orm_blocks, session, actor=actor)}
+            return [created[block.id] for block in orm_blocks]
+
     @enforce_types
     def update_block(self, block_id: str, block_update: BlockUpdate, actor: PydanticUser) -> PydanticBlock:
         """Update a block by its ID with the given BlockUpdate object."""
@@ -205,35 +218,22 @@ class BlockManager:
 
             # 7) Flush changes, then commit once
             block = block.update(db_session=session, actor=actor, no_commit=True)
-            session.commit()
 
-            return block.to_pydantic()
+            # Convert before the commit expires the block, rather than re-selecting it
+            checkpointed_block = block.to_pydantic()
+            session.commit()
+            return checkpointed_block
 
     @enforce_types
-    def _move_block_to_sequence(self, session: Session, block: BlockModel, target_seq: int, actor: PydanticUser) -> BlockModel:
+    def _move_block_to_entry(self, session: Session, block: BlockModel, target_entry: BlockHistory, actor: PydanticUser) -> BlockModel:
         """
-        Internal helper that moves the 'block' to the specified 'target_seq' within BlockHistory.
-        1) Find the BlockHistory row at sequence_number=target_seq
-        2) Copy fields into the block
-        3) Update and flush (no_commit=True) - the caller is responsible for final commit
-
-        Raises:
-            NoResultFound: if no BlockHistory row for (block_id, target_seq)
+        Internal helper that moves the 'block' to the given BlockHistory entry.
+        1) Copy the entry's fields into the block
+        2) Update and flush (no_commit=True) - the caller is responsible for final commit
         """
         if not block.id:
             raise ValueError("Block is missing an ID. Cannot move sequence.")
 
-        target_entry = (
-            session.query(BlockHistory)
-            .filter(
-                BlockHistory.block_id == block.id,
-                BlockHistory.sequence_number == target_seq,
-            )
-            .one_or_none()
-        )
-        if not target_entry:
-            raise NoResultFound(f"No BlockHistory row found for block_id={block.id} at sequence={target_seq}")
-
         # Copy fields from target_entry to block
         block.description = target_entry.description  # type: ignore
         block.label = target_entry.label  # type: ignore
@@ -283,11 +283,12 @@ class BlockManager:
                 raise ValueError(f"Block {block_id} is already at the earliest checkpoint (seq={current_seq}). Cannot undo further.")
 
             # 3) Move to that sequence
-            block = self._move_block_to_sequence(session, block, previous_entry.sequence_number, actor)
+            block = self._move_block_to_entry(session, block, previous_entry, actor)
 
-            # 4) Commit
+            # 4) Commit, converting first so the expired block isn't selected again
+            undone_block = block.to_pydantic()
             session.commit()
-            return block.to_pydantic()
+            return undone_block
 
     @enforce_types
     def redo_checkpoint_block(self, block_id: str, actor: PydanticUser, use_preloaded_block: Optional[BlockModel] = None) -> PydanticBlock:
@@ -322,7 +323,8 @@ class BlockManager:
             if not next_entry:
                 raise ValueError(f"Block {block_id} is at the highest checkpoint (seq={current_seq}). Cannot redo further.")
 
-            block = self._move_block_to_sequence(session, block, next_entry.sequence_number, actor)
+            block = self._move_block_to_entry(session, block, next_entry, actor)
 
+            redone_block = block.to_pydantic()
             session.commit()
-            return block.to_pydantic()
+            return redone_block
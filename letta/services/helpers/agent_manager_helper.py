@@ -1,7 +1,13 @@
+import base64
 import datetime
-from typing import List, Literal, Optional
+import json
+from functools import lru_cache
+from typing import List, Literal, Optional, Tuple
 
-from sqlalchemy import and_, asc, desc, func, literal, or_, select
+from sqlalchemy import asc, desc, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
 from letta import system
 from letta.constants import IN_CONTEXT_MEMORY_KEYWORD, STRUCTURED_OUTPUT_MODELS
@@ -66,6 +72,31 @@ def _process_relationship(
         current_relationship.extend(new_items)
 
 
+def _attach_relationship(session, association_class, item_column: str, model_class, agent_id: str, item_id: str) -> None:
+    """
+    Links an existing item to an agent with a single `INSERT ... SELECT ... ON CONFLICT DO NOTHING`, so attaching
+    an item that is already attached is a no-op instead of a read followed by a conditional write.
+
+    Args:
+        session: The database session.
+        association_class: The ORM class of the association table (e.g. `ToolsAgents`).
+        item_column: The association table's column referencing the item (e.g. 'tool_id').
+        model_class: The ORM class corresponding to the item.
+        agent_id: The ID of the agent.
+        item_id: The ID of the item to attach.
+
+    Raises:
+        NoResultFound: If the item does not exist.
+    """
+    insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    existing_item = select(literal(agent_id), model_class.id).where(model_class.id == item_id)
+    stmt = insert(association_class).from_select(["agent_id", item_column], existing_item).on_conflict_do_nothing()
+
+    # Nothing inserted means the item is either already attached or missing; only the rare case pays for a lookup
+    if session.execute(stmt).rowcount == 0 and session.execute(select(model_class.id).where(model_class.id == item_id)).first() is None:
+        raise NoResultFound(f"{model_class.__name__} with id {item_id} not found")
+
+
 def _process_tags(agent: AgentModel, tags: List[str], replace=True):
     """
     Handles tags for an agent.
@@ -80,13 +111,13 @@ def _process_tags(agent: AgentModel, tags: List[str], replace=True):
             agent.tags = []
         return
 
-    # Ensure tags are unique and prepare for replacement/extension
-    new_tags = {AgentsTags(agent_id=agent.id, tag=tag) for tag in set(tags)}
+    # Diff against the current tags so unchanged tags issue no statements: only removed tags are deleted
+    # (delete-orphan) and only new ones inserted, each as a single batch at flush
+    wanted_tags = set(tags)
+    existing_tags = {t.tag for t in agent.tags}
     if replace:
-        agent.tags = list(new_tags)
-    else:
-        existing_tags = {t.tag for t in agent.tags}
-        agent.tags.extend([tag for tag in new_tags if tag.tag not in existing_tags])
+        agent.tags = [t for t in agent.tags if t.tag in wanted_tags]
+    agent.tags.extend(AgentsTags(agent_id=agent.id, tag=tag) for tag in wanted_tags - existing_tags)
 
 
 def derive_system_message(agent_type: AgentType, enable_sleeptime: Optional[bool] = None, system: Optional[str] = None):
@@ -307,35 +338,68 @@ def check_supports_structured_output(model: str, tool_rules: List[ToolRule]) ->
 
 def _cursor_filter(created_at_col, id_col, ref_created_at, ref_id, forward: bool):
     """
-    Returns a SQLAlchemy filter expression for cursor-based pagination.
+    Returns a SQLAlchemy filter expression for keyset (seek) pagination.
 
     If `forward` is True, returns records after the reference.
     If `forward` is False, returns records before the reference.
+
+    The row-value comparison `(created_at, id) > (:created_at, :id)` lets the database seek straight into the
+    `(organization_id, created_at, id)` index instead of expanding into an OR that it has to scan.
     """
-    if forward:
-        return or_(
-            created_at_col > ref_created_at,
-            and_(created_at_col == ref_created_at, id_col > ref_id),
-        )
-    else:
-        return or_(
-            created_at_col < ref_created_at,
-            and_(created_at_col == ref_created_at, id_col < ref_id),
-        )
+    keyset = tuple_(created_at_col, id_col)
+    reference = tuple_(ref_created_at, ref_id)
+    return keyset > reference if forward else keyset < reference
+
+
+def encode_agent_cursor(agent: AgentState) -> str:
+    """
+    Encode an agent's sort key as an opaque `before`/`after` cursor for `list_agents`.
+
+    Unlike a raw agent id, the cursor carries `(created_at, id)` itself, so paging from it needs no lookup.
+    """
+    payload = json.dumps({"created_at": agent.created_at.isoformat(), "id": agent.id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_agent_cursor(cursor: str) -> Optional[Tuple[datetime.datetime, str]]:
+    """
+    Returns the `(created_at, id)` sort key in a cursor from `encode_agent_cursor`, or None for a raw agent id.
+
+    Raises:
+        ValueError: If the cursor is neither an agent id nor a cursor from `encode_agent_cursor`.
+    """
+    if cursor.startswith("agent-"):
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.datetime.fromisoformat(payload["created_at"]), payload["id"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError(f"Invalid pagination cursor: {cursor}")
 
 
 def _apply_pagination(query, before: Optional[str], after: Optional[str], session, ascending: bool = True) -> any:
-    if after:
-        result = session.execute(select(AgentModel.created_at, AgentModel.id).where(AgentModel.id == after)).first()
-        if result:
-            after_created_at, after_id = result
-            query = query.where(_cursor_filter(AgentModel.created_at, AgentModel.id, after_created_at, after_id, forward=ascending))
-
-    if before:
-        result = session.execute(select(AgentModel.created_at, AgentModel.id).where(AgentModel.id == before)).first()
-        if result:
-            before_created_at, before_id = result
-            query = query.where(_cursor_filter(AgentModel.created_at, AgentModel.id, before_created_at, before_id, forward=not ascending))
+    # Encoded cursors carry their sort key; raw agent ids have to be looked up
+    sort_keys = {cursor: key for cursor in (after, before) if cursor and (key := _decode_agent_cursor(cursor))}
+    cursor_ids = [cursor for cursor in (after, before) if cursor and cursor not in sort_keys]
+    if cursor_ids:
+        # Resolve both cursors' sort keys in a single round trip
+        sort_keys.update(
+            {
+                cursor_id: (created_at, cursor_id)
+                for cursor_id, created_at in session.execute(
+                    select(AgentModel.id, AgentModel.created_at).where(AgentModel.id.in_(cursor_ids))
+                ).all()
+            }
+        )
+        missing_ids = [cursor_id for cursor_id in cursor_ids if cursor_id not in sort_keys]
+        if missing_ids:
+            raise NoResultFound(f"No Agent found with id {missing_ids[0]}")
+
+    if after in sort_keys:
+        query = query.where(_cursor_filter(AgentModel.created_at, AgentModel.id, *sort_keys[after], forward=ascending))
+
+    if before in sort_keys:
+        query = query.where(_cursor_filter(AgentModel.created_at, AgentModel.id, *sort_keys[before], forward=not ascending))
 
     # Apply ordering
     order_fn = asc if ascending else desc
@@ -343,6 +407,56 @@ def _apply_pagination(query, before: Optional[str], after: Optional[str], sessio
     return query
 
 
+# Relationship behind each optional field of `AgentModel.to_pydantic`; the rest are never read when listing
+_AGENT_FIELD_RELATIONSHIPS = {
+    "tags": "tags",
+    "tools": "tools",
+    "sources": "sources",
+    "memory": "core_memory",
+    "identity_ids": "identities",
+    "multi_agent_group": "multi_agent_group",
+    "tool_exec_environment_variables": "tool_exec_environment_variables",
+}
+_AGENT_EAGER_LOADERS = {
+    name: joinedload(getattr(AgentModel, name)) if name == "multi_agent_group" else selectinload(getattr(AgentModel, name))
+    for name in _AGENT_FIELD_RELATIONSHIPS.values()
+}
+_AGENT_RAISE_LOADERS = {
+    name: raiseload(getattr(AgentModel, name)) for name in (*_AGENT_FIELD_RELATIONSHIPS.values(), "groups", "batch_items")
+}
+_ALL_AGENT_FIELD_LOADERS = (
+    *_AGENT_EAGER_LOADERS.values(),
+    _AGENT_RAISE_LOADERS["groups"],
+    _AGENT_RAISE_LOADERS["batch_items"],
+)
+
+
+def _apply_relationship_loaders(query, include_relationships: Optional[List[str]]):
+    """
+    Eagerly load only the relationships that `to_pydantic(include_relationships=...)` will read, each with a
+    single batched `WHERE agent_id IN (...)` query, and leave every other relationship unloaded. Touching an
+    unloaded relationship raises instead of quietly issuing one query per agent.
+
+    Args:
+        query: The SQLAlchemy query object to be modified.
+        include_relationships (Optional[List[str]]): The optional AgentState fields to populate; None means all of them.
+
+    Returns:
+        The query with loader options applied.
+    """
+    if include_relationships is None:
+        return query.options(*_ALL_AGENT_FIELD_LOADERS)
+
+    fields = _AGENT_FIELD_RELATIONSHIPS.keys() & set(include_relationships)
+    return query.options(*_relationship_loader_options(frozenset(_AGENT_FIELD_RELATIONSHIPS[field] for field in fields)))
+
+
+@lru_cache(maxsize=None)
+def _relationship_loader_options(relationships: frozenset) -> tuple:
+    """Loader options that eagerly load exactly `relationships`; built once per distinct set (at most 2^7 of them)."""
+    return tuple(_AGENT_EAGER_LOADERS[name] if name in relationships else loader for name, loader in _AGENT_RAISE_LOADERS.items())
+
+
 def _apply_tag_filter(query, tags: Optional[List[str]], match_all_tags: bool):
     """
     Apply tag-based filtering to the agent query.
@@ -422,7 +536,7 @@ def _apply_filters(
     # Filter by exact agent name if provided.
     if name:
         query = query.where(AgentModel.name == name)
-    # Apply a case-insensitive partial match for the agent's name.
+    # Apply a case-insensitive partial match for the agent's name (served by the trigram index on Postgres).
     if query_text:
         query = query.where(AgentModel.name.ilike(f"%{query_text}%"))
     # Filter agents by project ID.
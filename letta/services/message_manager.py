@@ -1,5 +1,5 @@
 import json
-from typing import List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from sqlalchemy import delete, exists, func, select, text
 
@@ -7,8 +7,9 @@ from letta.log import get_logger
 from letta.orm.agent import Agent as AgentModel
 from letta.orm.errors import NoResultFound
 from letta.orm.message import Message as MessageModel
+from letta.orm.sqlalchemy_base import AccessType
 from letta.schemas.enums import MessageRole
-from letta.schemas.letta_message import LettaMessageUpdateUnion
+from letta.schemas.letta_message import LettaMessage, LettaMessageUpdateUnion
 from letta.schemas.message import Message as PydanticMessage
 from letta.schemas.message import MessageUpdate
 from letta.schemas.user import User as PydanticUser
@@ -39,16 +40,16 @@ class MessageManager:
     def get_messages_by_ids(self, message_ids: List[str], actor: PydanticUser) -> List[PydanticMessage]:
         """Fetch messages by ID and return them in the requested order."""
         with self.session_maker() as session:
-            results = MessageModel.list(db_session=session, id=message_ids, organization_id=actor.organization_id, limit=len(message_ids))
-
-            if len(results) != len(message_ids):
-                logger.warning(
-                    f"Expected {len(message_ids)} messages, but found {len(results)}. Missing ids={set(message_ids) - set([r.id for r in results])}"
-                )
+            # One unordered `WHERE id IN (...)`; the requested order is restored below, so skip list()'s ORDER BY/LIMIT
+            results = MessageModel.read_multiple(db_session=session, identifiers=list(dict.fromkeys(message_ids)), actor=actor)
 
             # Sort results directly based on message_ids
             result_dict = {msg.id: msg.to_pydantic() for msg in results}
-            return list(filter(lambda x: x is not None, [result_dict.get(msg_id, None) for msg_id in message_ids]))
+            missing_ids = set(message_ids) - result_dict.keys()
+            if missing_ids:
+                logger.warning(f"Expected {len(set(message_ids))} messages, but found {len(result_dict)}. Missing ids={missing_ids}")
+
+            return [result_dict[msg_id] for msg_id in message_ids if msg_id in result_dict]
 
     @enforce_types
     def create_message(self, pydantic_msg: PydanticMessage, actor: PydanticUser) -> PydanticMessage:
@@ -94,49 +95,57 @@ class MessageManager:
     @enforce_types
     def update_message_by_letta_message(
         self, message_id: str, letta_message_update: LettaMessageUpdateUnion, actor: PydanticUser
-    ) -> PydanticMessage:
+    ) -> LettaMessage:
         """
         Updated the underlying messages table giving an update specified to the user-facing LettaMessage
         """
-        message = self.get_message_by_id(message_id=message_id, actor=actor)
-        if letta_message_update.message_type == "assistant_message":
-            # modify the tool call for send_message
-            # TODO: fix this if we add parallel tool calls
-            # TODO: note this only works if the AssistantMessage is generated by the standard send_message
-            assert (
-                message.tool_calls[0].function.name == "send_message"
-            ), f"Expected the first tool call to be send_message, but got {message.tool_calls[0].function.name}"
-            original_args = json.loads(message.tool_calls[0].function.arguments)
-            original_args["message"] = letta_message_update.content  # override the assistant message
-            update_tool_call = message.tool_calls[0].__deepcopy__()
-            update_tool_call.function.arguments = json.dumps(original_args)
+        return self.update_messages_by_letta_message([(message_id, letta_message_update)], actor=actor)[0]
 
-            update_message = MessageUpdate(tool_calls=[update_tool_call])
-        elif letta_message_update.message_type == "reasoning_message":
-            update_message = MessageUpdate(content=letta_message_update.reasoning)
-        elif letta_message_update.message_type == "user_message" or letta_message_update.message_type == "system_message":
-            update_message = MessageUpdate(content=letta_message_update.content)
-        else:
-            raise ValueError(f"Unsupported message type for modification: {letta_message_update.message_type}")
+    # Not @enforce_types: it can't check subscripted element hints like Tuple[...]
+    def update_messages_by_letta_message(
+        self, updates: List[Tuple[str, LettaMessageUpdateUnion]], actor: PydanticUser
+    ) -> List[LettaMessage]:
+        """
+        Apply several LettaMessage updates with one read of the affected messages and a single commit.
 
-        message = self.update_message_by_id(message_id=message_id, message_update=update_message, actor=actor)
+        Updates to the same message (e.g. its reasoning and its send_message call) are applied in order.
 
-        # convert back to LettaMessage
-        for letta_msg in message.to_letta_message(use_assistant_message=True):
-            if letta_msg.message_type == letta_message_update.message_type:
-                return letta_msg
-
-        # raise error if message type got modified
-        raise ValueError(f"Message type got modified: {letta_message_update.message_type}")
+        Args:
+            updates: (message_id, letta_message_update) pairs
+            actor: User performing the action
 
-    @enforce_types
-    def update_message_by_letta_message(
-        self, message_id: str, letta_message_update: LettaMessageUpdateUnion, actor: PydanticUser
-    ) -> PydanticMessage:
-        """
-        Updated the underlying messages table giving an update specified to the user-facing LettaMessage
+        Returns:
+            The updated LettaMessage for each update, in order
         """
-        message = self.get_message_by_id(message_id=message_id, actor=actor)
+        if not updates:
+            return []
+
+        with self.session_maker() as session:
+            message_ids = list(dict.fromkeys(message_id for message_id, _ in updates))
+            messages = {message.id: message for message in MessageModel.read_multiple(session, message_ids, actor=actor)}
+            missing_ids = set(message_ids) - messages.keys()
+            if missing_ids:
+                raise NoResultFound(f"Messages not found: {missing_ids}")
+
+            for message_id, letta_message_update in updates:
+                message = messages[message_id]
+                message_update = self._message_update_from_letta_message(message.to_pydantic(), letta_message_update)
+                self._apply_message_update(message, message_update)
+
+            # Every touched message is written by the same commit
+            for message in messages.values():
+                if session.is_modified(message):
+                    message.update(db_session=session, actor=actor, no_commit=True)
+            updated_messages = [
+                self._letta_message_of_type(messages[message_id].to_pydantic(), letta_message_update.message_type)
+                for message_id, letta_message_update in updates
+            ]
+            session.commit()
+            return updated_messages
+
+    @staticmethod
+    def _message_update_from_letta_message(message: PydanticMessage, letta_message_update: LettaMessageUpdateUnion) -> MessageUpdate:
+        """Translate an update to the user-facing LettaMessage into an update of the underlying message."""
         if letta_message_update.message_type == "assistant_message":
             # modify the tool call for send_message
             # TODO: fix this if we add parallel tool calls
@@ -149,23 +158,23 @@ class MessageManager:
             update_tool_call = message.tool_calls[0].__deepcopy__()
             update_tool_call.function.arguments = json.dumps(original_args)
 
-            update_message = MessageUpdate(tool_calls=[update_tool_call])
+            return MessageUpdate(tool_calls=[update_tool_call])
         elif letta_message_update.message_type == "reasoning_message":
-            update_message = MessageUpdate(content=letta_message_update.reasoning)
+            return MessageUpdate(content=letta_message_update.reasoning)
         elif letta_message_update.message_type == "user_message" or letta_message_update.message_type == "system_message":
-            update_message = MessageUpdate(content=letta_message_update.content)
+            return MessageUpdate(content=letta_message_update.content)
         else:
             raise ValueError(f"Unsupported message type for modification: {letta_message_update.message_type}")
 
-        message = self.update_message_by_id(message_id=message_id, message_update=update_message, actor=actor)
-
-        # convert back to LettaMessage
+    @staticmethod
+    def _letta_message_of_type(message: PydanticMessage, message_type: str) -> LettaMessage:
+        """Convert back to the LettaMessage of the type that was updated."""
         for letta_msg in message.to_letta_message(use_assistant_message=True):
-            if letta_msg.message_type == letta_message_update.message_type:
+            if letta_msg.message_type == message_type:
                 return letta_msg
 
         # raise error if message type got modified
-        raise ValueError(f"Message type got modified: {letta_message_update.message_type}")
+        raise ValueError(f"Message type got modified: {message_type}")
 
     @enforce_types
     def update_message_by_id(self, message_id: str, message_update: MessageUpdate, actor: PydanticUser) -> PydanticMessage:
@@ -180,26 +189,34 @@ class MessageManager:
                 actor=actor,
             )
 
-            # Some safety checks specific to messages
-            if message_update.tool_calls and message.role != MessageRole.assistant:
-                raise ValueError(
-                    f"Tool calls {message_update.tool_calls} can only be added to assistant messages. Message {message_id} has role {message.role}."
-                )
-            if message_update.tool_call_id and message.role != MessageRole.tool:
-                raise ValueError(
-                    f"Tool call IDs {message_update.tool_call_id} can only be added to tool messages. Message {message_id} has role {message.role}."
-                )
+            self._apply_message_update(message, message_update)
+            message.update(db_session=session, actor=actor, no_commit=True)
 
-            # get update dictionary
-            update_data = message_update.model_dump(to_orm=True, exclude_unset=True, exclude_none=True)
-            # Remove redundant update fields
-            update_data = {key: value for key, value in update_data.items() if getattr(message, key) != value}
+            # Convert before the commit expires the row, so the updated message is not refreshed with another SELECT
+            updated_message = message.to_pydantic()
+            session.commit()
+            return updated_message
+
+    @staticmethod
+    def _apply_message_update(message: MessageModel, message_update: MessageUpdate) -> None:
+        """Validate `message_update` against the message and set the fields that actually change."""
+        # Some safety checks specific to messages
+        if message_update.tool_calls and message.role != MessageRole.assistant:
+            raise ValueError(
+                f"Tool calls {message_update.tool_calls} can only be added to assistant messages. Message {message.id} has role {message.role}."
+            )
+        if message_update.tool_call_id and message.role != MessageRole.tool:
+            raise ValueError(
+                f"Tool call IDs {message_update.tool_call_id} can only be added to tool messages. Message {message.id} has role {message.role}."
+            )
 
-            for key, value in update_data.items():
-                setattr(message, key, value)
-            message.update(db_session=session, actor=actor)
+        # get update dictionary
+        update_data = message_update.model_dump(to_orm=True, exclude_unset=True, exclude_none=True)
+        # Remove redundant update fields
+        update_data = {key: value for key, value in update_data.items() if getattr(message, key) != value}
 
-            return message.to_pydantic()
+        for key, value in update_data.items():
+            setattr(message, key, value)
 
     @enforce_types
     def delete_message_by_id(self, message_id: str, actor: PydanticUser) -> bool:
@@ -231,6 +248,26 @@ class MessageManager:
         with self.session_maker() as session:
             return MessageModel.size(db_session=session, actor=actor, role=role, agent_id=agent_id)
 
+    @enforce_types
+    def sizes(self, agent_ids: List[str], actor: PydanticUser) -> Dict[str, int]:
+        """Get the message count of several agents with one grouped `COUNT(*)`.
+
+        Args:
+            agent_ids: The agents to count messages for
+            actor: The user requesting the counts
+
+        Returns:
+            Dict[str, int]: Message count per agent ID, 0 for agents without messages
+        """
+        if not agent_ids:
+            return {}
+
+        with self.session_maker() as session:
+            query = select(MessageModel.agent_id, func.count()).where(MessageModel.agent_id.in_(agent_ids)).group_by(MessageModel.agent_id)
+            query = MessageModel.apply_access_predicate(query, actor, ["read"], AccessType.ORGANIZATION)
+            counts = dict(session.execute(query).all())
+        return {agent_id: counts.get(agent_id, 0) for agent_id in agent_ids}
+
     @enforce_types
     def list_user_messages_for_agent(
         self,
@@ -305,15 +342,16 @@ class MessageManager:
 
             # If query_text is provided, filter messages using subquery + json_array_elements.
             if query_text:
-                content_element = func.json_array_elements(MessageModel.content).alias("content_element")
-                query = query.filter(
-                    exists(
-                        select(1)
-                        .select_from(content_element)
-                        .where(text("content_element->>'type' = 'text' AND content_element->>'text' ILIKE :query_text"))
-                        .params(query_text=f"%{query_text}%")
+                if session.get_bind().dialect.name == "postgresql":
+                    content_element = func.json_array_elements(MessageModel.content).alias("content_element")
+                    match = text("content_element->>'type' = 'text' AND content_element->>'text' ILIKE :query_text")
+                else:
+                    # SQLite has no json_array_elements; json_each walks the array, and LIKE is case-insensitive like ILIKE
+                    content_element = func.json_each(MessageModel.content).alias("content_element")
+                    match = text(
+                        "json_extract(content_element.value, '$.type') = 'text' AND json_extract(content_element.value, '$.text') LIKE :query_text"
                     )
-                )
+                query = query.filter(exists(select(1).select_from(content_element).where(match).params(query_text=f"%{query_text}%")))
 
             # If role(s) are provided, filter messages by those roles.
             if roles:
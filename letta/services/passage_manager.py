@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 from openai import OpenAI
 
@@ -36,9 +36,48 @@ class PassageManager:
                 except NoResultFound:
                     raise NoResultFound(f"Passage with id {passage_id} not found in database.")
 
+    @enforce_types
+    def get_passages_by_ids(self, passage_ids: List[str], actor: PydanticUser) -> Dict[str, PydanticPassage]:
+        """Fetch several passages with one `WHERE id IN (...)` per passage table, keyed by ID. Missing IDs are left out."""
+        passages = {}
+        with self.session_maker() as session:
+            remaining_ids = list(dict.fromkeys(passage_ids))
+            # Source passages first, matching get_passage_by_id; archival passages only for what is still missing
+            for model in (SourcePassage, AgentPassage):
+                if not remaining_ids:
+                    break
+                for passage in model.read_multiple(db_session=session, identifiers=remaining_ids, actor=actor):
+                    passages[passage.id] = passage.to_pydantic()
+                remaining_ids = [passage_id for passage_id in remaining_ids if passage_id not in passages]
+        return passages
+
     @enforce_types
     def create_passage(self, pydantic_passage: PydanticPassage, actor: PydanticUser) -> PydanticPassage:
         """Create a new passage in the appropriate table based on whether it has agent_id or source_id."""
+        passage = self._build_passage(pydantic_passage)
+        with self.session_maker() as session:
+            passage.create(session, actor=actor)
+            return passage.to_pydantic()
+
+    @enforce_types
+    def create_many_passages(self, passages: List[PydanticPassage], actor: PydanticUser) -> List[PydanticPassage]:
+        """Create multiple passages in a single database transaction, preserving the input order."""
+        if not passages:
+            return []
+
+        orm_passages = [self._build_passage(p) for p in passages]
+        agent_passages = [p for p in orm_passages if isinstance(p, AgentPassage)]
+        source_passages = [p for p in orm_passages if isinstance(p, SourcePassage)]
+
+        with self.session_maker() as session:
+            created = {}
+            for model, items in ((AgentPassage, agent_passages), (SourcePassage, source_passages)):
+                for passage in model.batch_create(items, session, actor=actor):
+                    created[passage.id] = passage.to_pydantic()
+            return [created[p.id] for p in orm_passages]
+
+    def _build_passage(self, pydantic_passage: PydanticPassage) -> Union[AgentPassage, SourcePassage]:
+        """Build the ORM passage for the table matching the passage's agent_id or source_id."""
         # Common fields for both passage types
         data = pydantic_passage.model_dump(to_orm=True)
         common_fields = {
@@ -68,14 +107,7 @@ class PassageManager:
         else:
             raise ValueError("Passage must have either agent_id or source_id")
 
-        with self.session_maker() as session:
-            passage.create(session, actor=actor)
-            return passage.to_pydantic()
-
-    @enforce_types
-    def create_many_passages(self, passages: List[PydanticPassage], actor: PydanticUser) -> List[PydanticPassage]:
-        """Create multiple passages."""
-        return [self.create_passage(p, actor) for p in passages]
+        return passage
 
     @enforce_types
     def insert_passage(
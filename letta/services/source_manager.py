@@ -1,8 +1,13 @@
 from typing import List, Optional
 
+from sqlalchemy import delete, select
+
 from letta.orm.errors import NoResultFound
 from letta.orm.file import FileMetadata as FileMetadataModel
+from letta.orm.passage import SourcePassage
 from letta.orm.source import Source as SourceModel
+from letta.orm.sources_agents import SourcesAgents
+from letta.orm.sqlalchemy_base import AccessType
 from letta.schemas.agent import AgentState as PydanticAgentState
 from letta.schemas.file import FileMetadata as PydanticFileMetadata
 from letta.schemas.source import Source as PydanticSource
@@ -61,6 +66,9 @@ class SourceManager:
         """Delete a source by its ID."""
         with self.session_maker() as session:
             source = SourceModel.read(db_session=session, identifier=source_id)
+            # Drop all of the source's passages with one DELETE before the ORM cascades through its files, so neither
+            # the passages nor their embeddings are loaded only to be deleted row by row
+            session.execute(delete(SourcePassage).where(SourcePassage.source_id == source.id))
             source.hard_delete(db_session=session, actor=actor)
             return source.to_pydantic()
 
@@ -97,6 +105,35 @@ class SourceManager:
             # and will be properly filtered by organization_id due to the OrganizationMixin
             return [agent.to_pydantic() for agent in source.agents]
 
+    @enforce_types
+    def list_attached_agent_ids(self, source_id: str, actor: Optional[PydanticUser] = None) -> List[str]:
+        """
+        Lists the IDs of all agents that have the specified source attached, without loading the source or the agents.
+
+        Args:
+            source_id: ID of the source to find attached agents for
+            actor: User performing the action (optional for now, following existing pattern)
+
+        Returns:
+            List[str]: IDs of the agents that have this source attached
+
+        Raises:
+            NoResultFound: If the source doesn't exist or the actor can't access it
+        """
+        with self.session_maker() as session:
+            # Outer join so an accessible source without agents still yields a row
+            query = (
+                select(SourceModel.id, SourcesAgents.agent_id)
+                .outerjoin(SourcesAgents, SourcesAgents.source_id == SourceModel.id)
+                .where(SourceModel.id == source_id, SourceModel.is_deleted == False)
+            )
+            if actor:
+                query = SourceModel.apply_access_predicate(query, actor, ["read"], AccessType.ORGANIZATION)
+            rows = session.execute(query).all()
+            if not rows:
+                raise NoResultFound(f"Source with id {source_id} not found")
+            return [agent_id for _, agent_id in rows if agent_id is not None]
+
     # TODO: We make actor optional for now, but should most likely be enforced due to security reasons
     @enforce_types
     def get_source_by_id(self, source_id: str, actor: Optional[PydanticUser] = None) -> Optional[PydanticSource]:
@@ -1,6 +1,7 @@
 import importlib
 import warnings
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from letta.constants import (
     BASE_FUNCTION_RETURN_CHAR_LIMIT,
@@ -26,6 +27,22 @@ from letta.utils import enforce_types, printd
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _base_function_set_names() -> Tuple[str, ...]:
+    """Names of the functions defined in the built-in function set modules; these only change with the code, so load them once."""
+    function_names = []
+    for module_name in ["base", "multi_agent"]:
+        module = importlib.import_module(f"letta.functions.function_sets.{module_name}")
+
+        try:
+            # Load the function set
+            function_names.extend(load_function_set(module))
+        except ValueError as e:
+            err = f"Error loading function set '{module_name}': {e}"
+            warnings.warn(err)
+    return tuple(dict.fromkeys(function_names))
+
+
 class ToolManager:
     """Manager class to handle business logic related to Tools."""
 
@@ -101,6 +118,25 @@ class ToolManager:
             tool.create(session, actor=actor)  # Re-raise other database-related errors
         return tool.to_pydantic()
 
+    @enforce_types
+    def create_many_tools(self, pydantic_tools: List[PydanticTool], actor: PydanticUser) -> List[PydanticTool]:
+        """Create multiple tools in a single database transaction, preserving the input order."""
+        if not pydantic_tools:
+            return []
+
+        orm_tools = []
+        for pydantic_tool in pydantic_tools:
+            # Work on a copy so the caller's tools are left untouched; set the organization id at the ORM layer
+            pydantic_tool = pydantic_tool.model_copy(update={"organization_id": actor.organization_id})
+            # Auto-generate description if not provided
+            if pydantic_tool.description is None:
+                pydantic_tool.description = pydantic_tool.json_schema.get("description", None)
+            orm_tools.append(ToolModel(**pydantic_tool.model_dump(to_orm=True)))
+
+        with self.session_maker() as session:
+            created = {tool.id: tool.to_pydantic() for tool in ToolModel.batch_create(orm_tools, session, actor=actor)}
+            return [created[tool.id] for tool in orm_tools]
+
     @enforce_types
     def get_tool_by_id(self, tool_id: str, actor: PydanticUser) -> PydanticTool:
         """Fetch a tool by its ID."""
@@ -181,27 +217,9 @@ class ToolManager:
     @enforce_types
     def upsert_base_tools(self, actor: PydanticUser) -> List[PydanticTool]:
         """Add default tools in base.py and multi_agent.py"""
-        functions_to_schema = {}
-        module_names = ["base", "multi_agent"]
-
-        for module_name in module_names:
-            full_module_name = f"letta.functions.function_sets.{module_name}"
-            try:
-                module = importlib.import_module(full_module_name)
-            except Exception as e:
-                # Handle other general exceptions
-                raise e
-
-            try:
-                # Load the function set
-                functions_to_schema.update(load_function_set(module))
-            except ValueError as e:
-                err = f"Error loading function set '{module_name}': {e}"
-                warnings.warn(err)
-
-        # create tool in db
-        tools = []
-        for name, schema in functions_to_schema.items():
+        # build the tool definitions
+        base_tools = []
+        for name in _base_function_set_names():
             if name in LETTA_TOOL_SET:
                 if name in BASE_TOOLS:
                     tool_type = ToolType.LETTA_CORE
@@ -220,20 +238,39 @@ class ToolManager:
                         f"Tool name {name} is not in the list of base tool names: {BASE_TOOLS + BASE_MEMORY_TOOLS + MULTI_AGENT_TOOLS + BASE_SLEEPTIME_TOOLS}"
                     )
 
-                # create to tool
-                tools.append(
-                    self.create_or_update_tool(
-                        PydanticTool(
-                            name=name,
-                            tags=tags,
-                            source_type="python",
-                            tool_type=tool_type,
-                            return_char_limit=BASE_FUNCTION_RETURN_CHAR_LIMIT,
-                        ),
-                        actor=actor,
+                base_tools.append(
+                    PydanticTool(
+                        name=name,
+                        tags=tags,
+                        source_type="python",
+                        tool_type=tool_type,
+                        return_char_limit=BASE_FUNCTION_RETURN_CHAR_LIMIT,
                     )
                 )
 
+        # look up which base tools already exist with one query, then create the missing ones in a single transaction
+        with self.session_maker() as session:
+            existing = {
+                tool.name: tool.to_pydantic()
+                for tool in ToolModel.list(
+                    db_session=session,
+                    name=[tool.name for tool in base_tools],
+                    organization_id=actor.organization_id,
+                    limit=len(base_tools),
+                )
+            }
+        created = {tool.name: tool for tool in self.create_many_tools([t for t in base_tools if t.name not in existing], actor=actor)}
+
+        tools = []
+        for tool in base_tools:
+            if tool.name in created:
+                tools.append(created[tool.name])
+            elif all(getattr(existing[tool.name], k) == v for k, v in tool.model_dump(exclude_unset=True, exclude_none=True).items()):
+                # Already holds exactly what create_or_update_tool would write, so skip the per-tool lookup and update
+                tools.append(existing[tool.name])
+            else:
+                tools.append(self.create_or_update_tool(tool, actor=actor))
+
         # TODO: Delete any base tools that are stale
 
         return tools
@@ -1,6 +1,7 @@
 import logging
+import os
 from datetime import datetime, timezone
-from typing import Generator
+from typing import Generator, Optional
 
 import pytest
 from anthropic.types.beta.messages import BetaMessageBatch, BetaMessageBatchRequestCounts
@@ -12,6 +13,44 @@ from letta.settings import tool_settings
 
 def pytest_configure(config):
     logging.basicConfig(level=logging.DEBUG)
+    _use_worker_database(os.getenv("PYTEST_XDIST_WORKER"))
+
+
+def _use_worker_database(worker: Optional[str]):
+    """
+    Under `pytest -n auto`, give every xdist worker its own `letta_test_<worker>` namespace before the engine
+    is created: a schema on Postgres, a directory holding the SQLite file otherwise. Workers can then wipe
+    and roll back tables without racing each other.
+    """
+    if not worker:
+        return
+
+    from sqlalchemy import event, text
+    from sqlalchemy.engine import Engine
+
+    from letta.orm import Base
+    from letta.server import db
+    from letta.settings import settings
+
+    name = f"letta_test_{worker}"
+    if not settings.letta_pg_uri_no_default:
+        db.config.recall_storage_path = os.path.join(db.config.recall_storage_path, name)
+        os.makedirs(db.config.recall_storage_path, exist_ok=True)
+        return
+
+    @event.listens_for(Engine, "connect")
+    def _set_worker_search_path(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET search_path TO {name}, public")
+        cursor.close()
+        # Commit so the pool's reset-on-return rollback doesn't undo the SET
+        dbapi_connection.commit()
+
+    db.initialize_engine()
+    with db.engine.begin() as connection:
+        connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{name}"'))
+    # Migrations only ever target the public schema, so build the worker's tables from the models
+    Base.metadata.create_all(bind=db.engine)
 
 
 @pytest.fixture
@@ -37,6 +76,19 @@ def check_e2b_key_is_set():
     yield
 
 
+@pytest.fixture(scope="session")
+def server():
+    """Single `SyncServer` shared by every test module; its managers hold no per-request state."""
+    from letta.config import LettaConfig
+    from letta.server.server import SyncServer
+
+    # Only write the config out the first time; rewriting an existing file on every run is pure disk I/O
+    if not LettaConfig.exists():
+        LettaConfig.load().save()
+
+    return SyncServer(init_with_default_org_and_user=False)
+
+
 @pytest.fixture
 def default_organization():
     """Fixture to create and return the default organization."""
@@ -107,7 +159,7 @@ def print_tool_func():
     yield print_tool
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dummy_beta_message_batch() -> BetaMessageBatch:
     return BetaMessageBatch(
         id="msgbatch_013Zva2CMHLNnXjNJJKqJ2EF",
@@ -11,7 +11,6 @@ from rich.console import Console
 from rich.syntax import Syntax
 
 from letta import create_client
-from letta.config import LettaConfig
 from letta.orm import Base
 from letta.orm.enums import ToolType
 from letta.schemas.agent import AgentState, CreateAgent
@@ -57,16 +56,6 @@ def local_client():
     yield client
 
 
-@pytest.fixture(scope="module")
-def server():
-    config = LettaConfig.load()
-
-    config.save()
-
-    server = SyncServer(init_with_default_org_and_user=False)
-    return server
-
-
 @pytest.fixture
 def default_organization(server: SyncServer):
     """Fixture to create and return the default organization."""
@@ -1,7 +1,10 @@
+import functools
+import importlib.metadata
 import os
-import random
-import string
+import shutil
+import tempfile
 import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from typing import List
 
@@ -11,10 +14,11 @@ from anthropic.types.beta import BetaMessage
 from anthropic.types.beta.messages import BetaMessageBatchIndividualResponse, BetaMessageBatchSucceededResult
 from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall as OpenAIToolCall
 from openai.types.chat.chat_completion_message_tool_call import Function as OpenAIFunction
+from sqlalchemy import bindparam, event, text
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.exc import StaleDataError
 
-from letta.config import LettaConfig
 from letta.constants import (
     BASE_MEMORY_TOOLS,
     BASE_SLEEPTIME_TOOLS,
@@ -64,9 +68,10 @@ from letta.schemas.tool import ToolCreate, ToolUpdate
 from letta.schemas.tool_rule import InitToolRule
 from letta.schemas.user import User as PydanticUser
 from letta.schemas.user import UserUpdate
+from letta.server import db
 from letta.server.db import db_context
 from letta.server.server import SyncServer
-from letta.services.block_manager import BlockManager
+from letta.services.helpers.agent_manager_helper import encode_agent_cursor
 from letta.services.organization_manager import OrganizationManager
 from letta.settings import tool_settings
 from tests.helpers.utils import comprehensive_agent_checks
@@ -81,22 +86,244 @@ DEFAULT_EMBEDDING_CONFIG = EmbeddingConfig(
     azure_version=None,
     azure_deployment=None,
 )
+GPT4_LLM_CONFIG = LLMConfig.default_config("gpt-4")
+OPENAI_EMBEDDING_CONFIG = EmbeddingConfig.default_config(provider="openai")
 CREATE_DELAY_SQLITE = 1
+GPT4O_MINI_LLM_CONFIG = LLMConfig.default_config("gpt-4o-mini")
+LETTA_EMBEDDING_CONFIG = EmbeddingConfig.default_config(model_name="letta")
 USING_SQLITE = not bool(os.getenv("LETTA_PG_URI"))
+# Memory-backed filesystem for the throwaway SQLite database, when the platform has one
+SQLITE_TMPFS_ROOT = "/dev/shm"
+
+
+def print_tool_fn(message: str):
+    """
+    Args:
+        message (str): The message to print.
+
+    Returns:
+        str: The message that was printed.
+    """
+    print(message)
+    return message
+
+
+def print_other_tool_fn(message: str):
+    """
+    Args:
+        message (str): The message to print.
+
+    Returns:
+        str: The message that was printed.
+    """
+    print(message)
+    return message
+
+
+# Tool sources and schemas are pure functions of the callables above, so derive them once per process
+PRINT_TOOL_SOURCE = parse_source_code(print_tool_fn)
+PRINT_TOOL_JSON_SCHEMA = derive_openai_json_schema(source_code=PRINT_TOOL_SOURCE)
+PRINT_OTHER_TOOL_SOURCE = parse_source_code(print_other_tool_fn)
+PRINT_OTHER_TOOL_JSON_SCHEMA = derive_openai_json_schema(source_code=PRINT_OTHER_TOOL_SOURCE)
+
+# Passage validation pads embeddings to MAX_EMBEDDING_DIM; do it once so bulk fixtures can use model_construct
+PADDED_TEST_EMBEDDING = PydanticPassage(text="", embedding=[0.1], embedding_config=DEFAULT_EMBEDDING_CONFIG).embedding
+
+# Computed once at import so the per-test cleanup doesn't rebuild them
+_CLEARED_TABLE_NAMES = tuple(table.name for table in reversed(Base.metadata.sorted_tables) if table.name != "block_history")
+# Rows behind the session-scoped fixtures live here, so out-of-band cleanups must leave them in place
+_SESSION_FIXTURE_TABLE_NAMES = ("organizations", "users")
+_VOLATILE_TABLE_NAMES = tuple(name for name in _CLEARED_TABLE_NAMES if name not in _SESSION_FIXTURE_TABLE_NAMES)
+
+
+_SQLITE_SEQUENCE_EXISTS = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_sequence'")
+
+
+@functools.lru_cache(maxsize=None)
+def _clear_tables_statements(table_names: tuple) -> tuple:
+    """
+    Prebuilt statements that empty `table_names`: a single TRUNCATE on Postgres, FK-ordered DELETEs on SQLite.
+    The SQLite variant also returns the sqlite_sequence reset, with the table names already bound.
+    """
+    quoted_names = ", ".join(f'"{name}"' for name in table_names)
+    if not USING_SQLITE:
+        return (text(f"TRUNCATE TABLE {quoted_names} RESTART IDENTITY CASCADE"),), None
+    reset_sequences = text("DELETE FROM sqlite_sequence WHERE name IN :names").bindparams(
+        bindparam("names", value=list(table_names), expanding=True)
+    )
+    return tuple(text(f'DELETE FROM "{name}"') for name in table_names), reset_sequences
+
+
+def _empty_tables(connection, table_names: tuple = _CLEARED_TABLE_NAMES):
+    statements, reset_sequences = _clear_tables_statements(table_names)
+    for statement in statements:
+        connection.execute(statement)
+    # sqlite_sequence only exists once a table declares AUTOINCREMENT
+    if reset_sequences is not None and connection.execute(_SQLITE_SEQUENCE_EXISTS).first():
+        connection.execute(reset_sequences)
+
+
+@functools.lru_cache(maxsize=None)
+def _clear_tables_script(table_names: tuple, reset_sequences: bool) -> str:
+    """SQLite only: the FK-ordered DELETEs (and optional sqlite_sequence reset) as one self-committing script."""
+    statements = [f'DELETE FROM "{name}"' for name in table_names]
+    if reset_sequences:
+        quoted_names = ", ".join(f"'{name}'" for name in table_names)
+        statements.append(f"DELETE FROM sqlite_sequence WHERE name IN ({quoted_names})")
+    return "BEGIN;\n" + ";\n".join(statements) + ";\nCOMMIT;"
+
+
+def _truncate_tables(table_names: tuple = _CLEARED_TABLE_NAMES):
+    if not USING_SQLITE:
+        with db_context() as session:
+            _empty_tables(session, table_names)
+            session.commit()
+        return
+
+    # executescript sends every DELETE in a single driver call; it commits on its own, so it only fits
+    # here and not inside the rolled-back per-test transaction
+    connection = db.engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        reset_sequences = cursor.execute(_SQLITE_SEQUENCE_EXISTS.text).fetchone() is not None
+        cursor.executescript(_clear_tables_script(table_names, reset_sequences))
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def _configure_sqlite_engine(engine):
+    """The test database is throwaway, so skip fsyncs and keep the rollback journal and temp tables in memory."""
+
+    @event.listens_for(engine, "connect")
+    def _configure_connection(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    # Drop pooled connections so every connection from here on gets the listener
+    engine.dispose()
+
+
+def _use_explicit_begin(connection):
+    """
+    pysqlite's implicit transaction handling breaks SAVEPOINT, so on the connection the rolled-back test transactions
+    run on, turn it off and let SQLAlchemy emit BEGIN itself. Every other connection keeps the driver default, so tests
+    that opt out with `clear_tables` lock the database the same way production does.
+    """
+    connection.connection.dbapi_connection.isolation_level = None
+
+    @event.listens_for(connection, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _db_connection():
+    """Wipes leftover rows once, then yields the connection each test's rolled-back transaction runs on."""
+    tmpfs_dir = None
+    if USING_SQLITE and not db._engine_initialized and os.path.isdir(SQLITE_TMPFS_ROOT):
+        # Nothing has opened the database yet, so point it at a throwaway file in memory-backed storage
+        tmpfs_dir = tempfile.mkdtemp(prefix="letta_test_", dir=SQLITE_TMPFS_ROOT)
+        db.config.recall_storage_path = tmpfs_dir
+
+    db.initialize_engine()
+    if USING_SQLITE:
+        _configure_sqlite_engine(db.engine)
+    _truncate_tables()
+
+    connection = db.engine.connect()
+    if USING_SQLITE:
+        _use_explicit_begin(connection)
+    yield connection
+    if USING_SQLITE:
+        # Don't hand the reconfigured driver connection back to the pool
+        connection.invalidate()
+    connection.close()
+
+    if tmpfs_dir:
+        db.engine.dispose()
+        shutil.rmtree(tmpfs_dir, ignore_errors=True)
+
+
+def _stamp_created_at():
+    """
+    Returns a `before_flush` hook giving new rows a strictly increasing `created_at` when none was set. The server
+    default can't order rows inside the rolled-back test transaction: Postgres' now() is the transaction start time,
+    and SQLite's only has one-second resolution.
+    """
+    last_stamp = datetime.min.replace(tzinfo=timezone.utc)
+
+    def _before_flush(session, flush_context, instances):
+        nonlocal last_stamp
+        for instance in session.new:
+            if hasattr(instance, "created_at") and instance.created_at is None:
+                last_stamp = max(datetime.now(timezone.utc), last_stamp + timedelta(microseconds=1))
+                instance.created_at = last_stamp
+
+    return _before_flush
 
 
 @pytest.fixture(autouse=True)
-def _clear_tables():
-    with db_context() as session:
-        for table in reversed(Base.metadata.sorted_tables):  # Reverse to avoid FK issues
-            # If this is the block_history table, skip it
-            if table.name == "block_history":
-                continue
-            session.execute(table.delete())  # Truncate table
-        session.commit()
+def _transactional_db(request, _db_connection, monkeypatch):
+    """
+    Runs each test inside a transaction that is rolled back at teardown. Every session handed out by
+    `db_context` joins it through a SAVEPOINT, so manager commits never reach the database, and stamps
+    `created_at` on the rows it inserts so they still sort in creation order.
+    Session-scoped fixtures are set up before this runs, so their rows are committed and shared.
+
+    Tests marked `isolated` start from empty tables (restored by the rollback), and tests that use
+    `clear_tables` opt out and commit for real.
+    """
+    if "clear_tables" in request.fixturenames:
+        yield
+        return
+
+    transaction = _db_connection.begin()
+    session_factory = sessionmaker(bind=_db_connection, autoflush=False, join_transaction_mode="create_savepoint")
+    event.listen(session_factory, "before_flush", _stamp_created_at())
+    monkeypatch.setattr(db, "SessionLocal", session_factory)
+    if request.node.get_closest_marker("isolated"):
+        _empty_tables(_db_connection)
+    yield
+    transaction.rollback()
+
+
+@pytest.fixture
+def clear_tables():
+    """For tests whose sessions must commit out-of-band (e.g. interleaved sessions); keeps the session-scoped org and users."""
+    _truncate_tables(_VOLATILE_TABLE_NAMES)
+    yield
+    _truncate_tables(_VOLATILE_TABLE_NAMES)
 
 
 @pytest.fixture
+def count_queries(_db_connection):
+    """
+    Context manager recording the statements the test's connection executes, so a test can assert that a path
+    issues a fixed number of queries rather than one per row. Savepoint and transaction control is not recorded.
+    """
+
+    @contextmanager
+    def record():
+        statements = []
+
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE", "ROLLBACK", "BEGIN", "COMMIT")):
+                statements.append(statement)
+
+        event.listen(_db_connection, "before_cursor_execute", _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(_db_connection, "before_cursor_execute", _before_cursor_execute)
+
+    return record
+
+
+@pytest.fixture(scope="session")
 def default_organization(server: SyncServer):
     """Fixture to create and return the default organization."""
     org = server.organization_manager.create_default_organization()
@@ -110,14 +337,14 @@ def other_organization(server: SyncServer):
     yield org
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def default_user(server: SyncServer, default_organization):
     """Fixture to create and return the default user within the default organization."""
     user = server.user_manager.create_default_user(org_id=default_organization.id)
     yield user
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def other_user(server: SyncServer, default_organization):
     """Fixture to create and return the default user within the default organization."""
     user = server.user_manager.create_user(PydanticUser(name="other", organization_id=default_organization.id))
@@ -156,59 +383,18 @@ def other_source(server: SyncServer, default_user):
 
 
 @pytest.fixture
-def default_file(server: SyncServer, default_source, default_user, default_organization):
+def default_file(server: SyncServer, default_source, default_user):
     file = server.source_manager.create_file(
-        PydanticFileMetadata(file_name="test_file", organization_id=default_organization.id, source_id=default_source.id),
+        PydanticFileMetadata(file_name="test_file", organization_id=default_user.organization_id, source_id=default_source.id),
         actor=default_user,
     )
     yield file
 
 
-@pytest.fixture
-def print_tool(server: SyncServer, default_user, default_organization):
-    """Fixture to create a tool with default settings and clean up after the test."""
-
-    def print_tool(message: str):
-        """
-        Args:
-            message (str): The message to print.
-
-        Returns:
-            str: The message that was printed.
-        """
-        print(message)
-        return message
-
-    # Set up tool details
-    source_code = parse_source_code(print_tool)
-    source_type = "python"
-    description = "test_description"
-    tags = ["test"]
-    metadata = {"a": "b"}
-
-    tool = PydanticTool(description=description, tags=tags, source_code=source_code, source_type=source_type, metadata_=metadata)
-    derived_json_schema = derive_openai_json_schema(source_code=tool.source_code, name=tool.name)
-
-    derived_name = derived_json_schema["name"]
-    tool.json_schema = derived_json_schema
-    tool.name = derived_name
-
-    tool = server.tool_manager.create_tool(tool, actor=default_user)
-
-    # Yield the created tool
-    yield tool
-
-
-@pytest.fixture
-def composio_github_star_tool(server, default_user):
-    tool_create = ToolCreate.from_composio(action_name="GITHUB_STAR_A_REPOSITORY_FOR_THE_AUTHENTICATED_USER")
-    tool = server.tool_manager.create_or_update_composio_tool(tool_create=tool_create, actor=default_user)
-    yield tool
-
-
-@pytest.fixture
-def mcp_tool(server, default_user):
-    mcp_tool = MCPTool(
+@pytest.fixture(scope="session")
+def _default_tools():
+    """Unsaved tool definitions built once per session; fixtures persist a copy so validation runs only here."""
+    weather_lookup = MCPTool(
         name="weather_lookup",
         description="Fetches the current weather for a given location.",
         inputSchema={
@@ -224,9 +410,72 @@ def mcp_tool(server, default_user):
             "required": ["location"],
         },
     )
-    mcp_server_name = "test"
-    tool_create = ToolCreate.from_mcp(mcp_server_name=mcp_server_name, mcp_tool=mcp_tool)
-    tool = server.tool_manager.create_or_update_mcp_tool(tool_create=tool_create, mcp_server_name=mcp_server_name, actor=default_user)
+    return {
+        "print_tool": PydanticTool(
+            name=PRINT_TOOL_JSON_SCHEMA["name"],
+            description="test_description",
+            tags=["test"],
+            source_code=PRINT_TOOL_SOURCE,
+            source_type="python",
+            metadata_={"a": "b"},
+            json_schema=PRINT_TOOL_JSON_SCHEMA,
+        ),
+        "other_tool": PydanticTool(
+            name=PRINT_OTHER_TOOL_JSON_SCHEMA["name"],
+            description="other_tool_description",
+            tags=["test"],
+            source_code=PRINT_OTHER_TOOL_SOURCE,
+            source_type="python",
+            json_schema=PRINT_OTHER_TOOL_JSON_SCHEMA,
+        ),
+        "weather_lookup": ToolCreate.from_mcp(mcp_server_name="test", mcp_tool=weather_lookup),
+    }
+
+
+@pytest.fixture
+def print_tool(server: SyncServer, default_user, _default_tools):
+    """Fixture to create a tool with default settings and clean up after the test."""
+    tool = server.tool_manager.create_tool(_default_tools["print_tool"].model_copy(deep=True), actor=default_user)
+
+    # Yield the created tool
+    yield tool
+
+
+@pytest.fixture(scope="session")
+def _composio_tool_creates(request):
+    """
+    ToolCreate.from_composio fetches the action schema from Composio, and the result only changes with the
+    composio release. Memoize it per session and persist it across runs in pytest's cache, keyed on that version.
+    """
+    composio_version = importlib.metadata.version("composio-core")
+    tool_creates = {}
+
+    def from_composio(action_name: str) -> ToolCreate:
+        if action_name not in tool_creates:
+            cache_key = f"letta/composio_tool_create/{composio_version}/{action_name}"
+            cached = request.config.cache.get(cache_key, None)
+            if cached is None:
+                tool_create = ToolCreate.from_composio(action_name=action_name)
+                request.config.cache.set(cache_key, tool_create.model_dump(mode="json"))
+            else:
+                tool_create = ToolCreate.model_validate(cached)
+            tool_creates[action_name] = tool_create
+        return tool_creates[action_name].model_copy(deep=True)
+
+    return from_composio
+
+
+@pytest.fixture
+def composio_github_star_tool(server, default_user, _composio_tool_creates):
+    tool_create = _composio_tool_creates("GITHUB_STAR_A_REPOSITORY_FOR_THE_AUTHENTICATED_USER")
+    tool = server.tool_manager.create_or_update_composio_tool(tool_create=tool_create, actor=default_user)
+    yield tool
+
+
+@pytest.fixture
+def mcp_tool(server, default_user, _default_tools):
+    tool_create = _default_tools["weather_lookup"].model_copy(deep=True)
+    tool = server.tool_manager.create_or_update_mcp_tool(tool_create=tool_create, mcp_server_name="test", actor=default_user)
     yield tool
 
 
@@ -290,41 +539,36 @@ def source_passage_fixture(server: SyncServer, default_user, default_file, defau
 @pytest.fixture
 def create_test_passages(server: SyncServer, default_file, default_user, sarah_agent, default_source):
     """Helper function to create test passages for all tests."""
-    # Create agent passages
-    passages = []
-    for i in range(5):
-        passage = server.passage_manager.create_passage(
-            PydanticPassage(
-                text=f"Agent passage {i}",
-                agent_id=sarah_agent.id,
-                organization_id=default_user.organization_id,
-                embedding=[0.1],
-                embedding_config=DEFAULT_EMBEDDING_CONFIG,
-                metadata={"type": "test"},
-            ),
-            actor=default_user,
-        )
-        passages.append(passage)
-        if USING_SQLITE:
-            time.sleep(CREATE_DELAY_SQLITE)
+    # Strictly increasing timestamps keep the creation order stable without sleeping between inserts
+    base_ts = datetime.now(timezone.utc)
 
-    # Create source passages
-    for i in range(5):
-        passage = server.passage_manager.create_passage(
-            PydanticPassage(
-                text=f"Source passage {i}",
-                source_id=default_source.id,
-                file_id=default_file.id,
-                organization_id=default_user.organization_id,
-                embedding=[0.1],
-                embedding_config=DEFAULT_EMBEDDING_CONFIG,
-                metadata={"type": "test"},
-            ),
-            actor=default_user,
+    # Build all passages up front and insert them in a single transaction
+    passages = [
+        PydanticPassage.model_construct(
+            text=f"Agent passage {i}",
+            agent_id=sarah_agent.id,
+            organization_id=default_user.organization_id,
+            embedding=PADDED_TEST_EMBEDDING,
+            embedding_config=DEFAULT_EMBEDDING_CONFIG,
+            metadata={"type": "test"},
+            created_at=base_ts + timedelta(microseconds=i),
         )
-        passages.append(passage)
-        if USING_SQLITE:
-            time.sleep(CREATE_DELAY_SQLITE)
+        for i in range(5)
+    ]
+    passages += [
+        PydanticPassage.model_construct(
+            text=f"Source passage {i}",
+            source_id=default_source.id,
+            file_id=default_file.id,
+            organization_id=default_user.organization_id,
+            embedding=PADDED_TEST_EMBEDDING,
+            embedding_config=DEFAULT_EMBEDDING_CONFIG,
+            metadata={"type": "test"},
+            created_at=base_ts + timedelta(microseconds=5 + i),
+        )
+        for i in range(5)
+    ]
+    passages = server.passage_manager.create_many_passages(passages, actor=default_user)
 
     return passages
 
@@ -369,7 +613,7 @@ def sandbox_env_var_fixture(server: SyncServer, sandbox_config_fixture, default_
 @pytest.fixture
 def default_block(server: SyncServer, default_user):
     """Fixture to create and return a default block."""
-    block_manager = BlockManager()
+    block_manager = server.block_manager
     block_data = PydanticBlock(
         label="default_label",
         value="Default Block Content",
@@ -384,7 +628,7 @@ def default_block(server: SyncServer, default_user):
 @pytest.fixture
 def other_block(server: SyncServer, default_user):
     """Fixture to create and return another block."""
-    block_manager = BlockManager()
+    block_manager = server.block_manager
     block_data = PydanticBlock(
         label="other_label",
         value="Other Block Content",
@@ -397,46 +641,22 @@ def other_block(server: SyncServer, default_user):
 
 
 @pytest.fixture
-def other_tool(server: SyncServer, default_user, default_organization):
-    def print_other_tool(message: str):
-        """
-        Args:
-            message (str): The message to print.
-
-        Returns:
-            str: The message that was printed.
-        """
-        print(message)
-        return message
-
-    # Set up tool details
-    source_code = parse_source_code(print_other_tool)
-    source_type = "python"
-    description = "other_tool_description"
-    tags = ["test"]
-
-    tool = PydanticTool(description=description, tags=tags, source_code=source_code, source_type=source_type)
-    derived_json_schema = derive_openai_json_schema(source_code=tool.source_code, name=tool.name)
-
-    derived_name = derived_json_schema["name"]
-    tool.json_schema = derived_json_schema
-    tool.name = derived_name
-
-    tool = server.tool_manager.create_tool(tool, actor=default_user)
+def other_tool(server: SyncServer, default_user, _default_tools):
+    tool = server.tool_manager.create_tool(_default_tools["other_tool"].model_copy(deep=True), actor=default_user)
 
     # Yield the created tool
     yield tool
 
 
 @pytest.fixture
-def sarah_agent(server: SyncServer, default_user, default_organization):
+def sarah_agent(server: SyncServer, default_user):
     """Fixture to create and return a sample agent within the default organization."""
     agent_state = server.agent_manager.create_agent(
         agent_create=CreateAgent(
             name="sarah_agent",
             memory_blocks=[],
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
+            llm_config=GPT4_LLM_CONFIG,
+            embedding_config=OPENAI_EMBEDDING_CONFIG,
             include_base_tools=False,
         ),
         actor=default_user,
@@ -445,14 +665,14 @@ def sarah_agent(server: SyncServer, default_user, default_organization):
 
 
 @pytest.fixture
-def charles_agent(server: SyncServer, default_user, default_organization):
+def charles_agent(server: SyncServer, default_user):
     """Fixture to create and return a sample agent within the default organization."""
     agent_state = server.agent_manager.create_agent(
         agent_create=CreateAgent(
             name="charles_agent",
             memory_blocks=[CreateBlock(label="human", value="Charles"), CreateBlock(label="persona", value="I am a helpful assistant")],
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
+            llm_config=GPT4_LLM_CONFIG,
+            embedding_config=OPENAI_EMBEDDING_CONFIG,
             include_base_tools=False,
         ),
         actor=default_user,
@@ -466,8 +686,8 @@ def comprehensive_test_agent_fixture(server: SyncServer, default_user, print_too
     create_agent_request = CreateAgent(
         system="test system",
         memory_blocks=memory_blocks,
-        llm_config=LLMConfig.default_config("gpt-4"),
-        embedding_config=EmbeddingConfig.default_config(provider="openai"),
+        llm_config=GPT4_LLM_CONFIG,
+        embedding_config=OPENAI_EMBEDDING_CONFIG,
         block_ids=[default_block.id],
         tool_ids=[print_tool.id],
         source_ids=[default_source.id],
@@ -488,16 +708,6 @@ def comprehensive_test_agent_fixture(server: SyncServer, default_user, print_too
     yield created_agent, create_agent_request
 
 
-@pytest.fixture(scope="module")
-def server():
-    config = LettaConfig.load()
-
-    config.save()
-
-    server = SyncServer(init_with_default_org_and_user=False)
-    return server
-
-
 @pytest.fixture
 def agent_passages_setup(server, default_source, default_user, sarah_agent):
     """Setup fixture for agent passages tests"""
@@ -506,35 +716,33 @@ def agent_passages_setup(server, default_source, default_user, sarah_agent):
 
     server.agent_manager.attach_source(agent_id=agent_id, source_id=default_source.id, actor=actor)
 
-    # Create some source passages
-    source_passages = []
-    for i in range(3):
-        passage = server.passage_manager.create_passage(
-            PydanticPassage(
-                organization_id=actor.organization_id,
-                source_id=default_source.id,
-                text=f"Source passage {i}",
-                embedding=[0.1],  # Default OpenAI embedding size
-                embedding_config=DEFAULT_EMBEDDING_CONFIG,
-            ),
-            actor=actor,
-        )
-        source_passages.append(passage)
+    base_ts = datetime.now(timezone.utc)
 
-    # Create some agent passages
-    agent_passages = []
-    for i in range(2):
-        passage = server.passage_manager.create_passage(
-            PydanticPassage(
-                organization_id=actor.organization_id,
-                agent_id=agent_id,
-                text=f"Agent passage {i}",
-                embedding=[0.1],  # Default OpenAI embedding size
-                embedding_config=DEFAULT_EMBEDDING_CONFIG,
-            ),
-            actor=actor,
+    # Create some source passages and agent passages in one batch
+    source_passages = [
+        PydanticPassage.model_construct(
+            organization_id=actor.organization_id,
+            source_id=default_source.id,
+            text=f"Source passage {i}",
+            embedding=PADDED_TEST_EMBEDDING,
+            embedding_config=DEFAULT_EMBEDDING_CONFIG,
+            created_at=base_ts + timedelta(microseconds=i),
         )
-        agent_passages.append(passage)
+        for i in range(3)
+    ]
+    agent_passages = [
+        PydanticPassage.model_construct(
+            organization_id=actor.organization_id,
+            agent_id=agent_id,
+            text=f"Agent passage {i}",
+            embedding=PADDED_TEST_EMBEDDING,
+            embedding_config=DEFAULT_EMBEDDING_CONFIG,
+            created_at=base_ts + timedelta(microseconds=3 + i),
+        )
+        for i in range(2)
+    ]
+    created = server.passage_manager.create_many_passages(source_passages + agent_passages, actor=actor)
+    source_passages, agent_passages = created[: len(source_passages)], created[len(source_passages) :]
 
     yield agent_passages, source_passages
 
@@ -549,8 +757,8 @@ def agent_with_tags(server: SyncServer, default_user):
         agent_create=CreateAgent(
             name="agent1",
             tags=["primary_agent", "benefit_1"],
-            llm_config=LLMConfig.default_config("gpt-4o-mini"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
+            llm_config=GPT4O_MINI_LLM_CONFIG,
+            embedding_config=OPENAI_EMBEDDING_CONFIG,
             memory_blocks=[],
             include_base_tools=False,
         ),
@@ -561,8 +769,8 @@ def agent_with_tags(server: SyncServer, default_user):
         agent_create=CreateAgent(
             name="agent2",
             tags=["primary_agent", "benefit_2"],
-            llm_config=LLMConfig.default_config("gpt-4o-mini"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
+            llm_config=GPT4O_MINI_LLM_CONFIG,
+            embedding_config=OPENAI_EMBEDDING_CONFIG,
             memory_blocks=[],
             include_base_tools=False,
         ),
@@ -573,8 +781,8 @@ def agent_with_tags(server: SyncServer, default_user):
         agent_create=CreateAgent(
             name="agent3",
             tags=["primary_agent", "benefit_1", "benefit_2"],
-            llm_config=LLMConfig.default_config("gpt-4o-mini"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
+            llm_config=GPT4O_MINI_LLM_CONFIG,
+            embedding_config=OPENAI_EMBEDDING_CONFIG,
             memory_blocks=[],
             include_base_tools=False,
         ),
@@ -584,22 +792,29 @@ def agent_with_tags(server: SyncServer, default_user):
     return [agent1, agent2, agent3]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def embed_model():
+    """Embedding client for DEFAULT_EMBEDDING_CONFIG; it holds no per-test state, so it is built once."""
+    return embedding_model(DEFAULT_EMBEDDING_CONFIG)
+
+
+@pytest.fixture(scope="session")
 def dummy_llm_config() -> LLMConfig:
-    return LLMConfig.default_config("gpt-4")
+    return GPT4_LLM_CONFIG
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dummy_tool_rules_solver() -> ToolRulesSolver:
     return ToolRulesSolver(tool_rules=[InitToolRule(tool_name="send_message")])
 
 
-@pytest.fixture
+# Tests only read these and pass them to the managers, which serialize them, so one instance serves the whole session
+@pytest.fixture(scope="session")
 def dummy_step_state(dummy_tool_rules_solver: ToolRulesSolver) -> AgentStepState:
     return AgentStepState(step_number=1, tool_rules_solver=dummy_tool_rules_solver)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dummy_successful_response() -> BetaMessageBatchIndividualResponse:
     return BetaMessageBatchIndividualResponse(
         custom_id="my-second-request",
@@ -655,8 +870,8 @@ def test_create_agent_passed_in_initial_messages(server: SyncServer, default_use
     create_agent_request = CreateAgent(
         system="test system",
         memory_blocks=memory_blocks,
-        llm_config=LLMConfig.default_config("gpt-4"),
-        embedding_config=EmbeddingConfig.default_config(provider="openai"),
+        llm_config=GPT4_LLM_CONFIG,
+        embedding_config=OPENAI_EMBEDDING_CONFIG,
         block_ids=[default_block.id],
         tags=["a", "b"],
         description="test_description",
@@ -682,8 +897,8 @@ def test_create_agent_default_initial_message(server: SyncServer, default_user,
     create_agent_request = CreateAgent(
         system="test system",
         memory_blocks=memory_blocks,
-        llm_config=LLMConfig.default_config("gpt-4"),
-        embedding_config=EmbeddingConfig.default_config(provider="openai"),
+        llm_config=GPT4_LLM_CONFIG,
+        embedding_config=OPENAI_EMBEDDING_CONFIG,
         block_ids=[default_block.id],
         tags=["a", "b"],
         description="test_description",
@@ -700,6 +915,37 @@ def test_create_agent_default_initial_message(server: SyncServer, default_user,
     assert create_agent_request.memory_blocks[0].value in init_messages[0].content[0].text
 
 
+def test_create_many_agents(server: SyncServer, default_user, default_block):
+    create_agent_requests = [
+        CreateAgent(
+            name=name,
+            system=f"{name} system",
+            llm_config=GPT4_LLM_CONFIG,
+            embedding_config=OPENAI_EMBEDDING_CONFIG,
+            block_ids=[default_block.id],
+            tags=[name],
+            initial_message_sequence=initial_message_sequence,
+            include_base_tools=False,
+        )
+        for name, initial_message_sequence in [
+            ("bulk_agent_a", None),
+            ("bulk_agent_b", [MessageCreate(role=MessageRole.user, content="hello world")]),
+        ]
+    ]
+    agent_states = server.agent_manager.create_many_agents(create_agent_requests, actor=default_user)
+
+    # Agents come back in input order, each with its own initial message sequence
+    assert [agent_state.name for agent_state in agent_states] == ["bulk_agent_a", "bulk_agent_b"]
+    sizes = server.message_manager.sizes([agent_state.id for agent_state in agent_states], actor=default_user)
+    for agent_state, expected_size in zip(agent_states, [4, 2]):
+        assert agent_state.tags == [agent_state.name]
+        assert [block.id for block in agent_state.memory.blocks] == [default_block.id]
+        assert sizes[agent_state.id] == expected_size
+        init_messages = server.agent_manager.get_in_context_messages(agent_id=agent_state.id, actor=default_user)
+        assert [message.id for message in init_messages] == agent_state.message_ids
+        assert f"{agent_state.name} system" in init_messages[0].content[0].text
+
+
 def test_create_agent_with_json_in_system_message(server: SyncServer, default_user, default_block):
     system_prompt = (
         "You are an expert teaching agent with encyclopedic knowledge. "
@@ -710,8 +956,8 @@ def test_create_agent_with_json_in_system_message(server: SyncServer, default_us
     )
     create_agent_request = CreateAgent(
         system=system_prompt,
-        llm_config=LLMConfig.default_config("gpt-4"),
-        embedding_config=EmbeddingConfig.default_config(provider="openai"),
+        llm_config=GPT4_LLM_CONFIG,
+        embedding_config=OPENAI_EMBEDDING_CONFIG,
         block_ids=[default_block.id],
         tags=["a", "b"],
         description="test_description",
@@ -740,8 +986,8 @@ def test_update_agent(server: SyncServer, comprehensive_test_agent_fixture, othe
         tool_rules=[InitToolRule(tool_name=other_tool.name)],
         tags=["c", "d"],
         system="train system",
-        llm_config=LLMConfig.default_config("gpt-4o-mini"),
-        embedding_config=EmbeddingConfig.default_config(model_name="letta"),
+        llm_config=GPT4O_MINI_LLM_CONFIG,
+        embedding_config=LETTA_EMBEDDING_CONFIG,
         message_ids=["10", "20"],
         metadata={"train_key": "train_value"},
         tool_exec_environment_variables={"test_env_var_key_a": "a", "new_tool_exec_key": "n"},
@@ -853,101 +1099,89 @@ def test_list_agents_select_fields_mixed(server: SyncServer, comprehensive_test_
     assert not hasattr(agent, "invalid_field")
 
 
-def test_list_agents_ascending(server: SyncServer, default_user):
-    # Create two agents with known names
-    agent1 = server.agent_manager.create_agent(
-        agent_create=CreateAgent(
-            name="agent_oldest",
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
-            memory_blocks=[],
-            include_base_tools=False,
-        ),
-        actor=default_user,
-    )
+def _assert_order(names, *expected):
+    """Assert that each of `expected` appears in `names`, in the given order."""
+    positions = {name: i for i, name in enumerate(names)}
+    assert all(positions[a] < positions[b] for a, b in zip(expected, expected[1:])), names
 
-    if USING_SQLITE:
-        time.sleep(CREATE_DELAY_SQLITE)
 
-    agent2 = server.agent_manager.create_agent(
-        agent_create=CreateAgent(
-            name="agent_newest",
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
-            memory_blocks=[],
-            include_base_tools=False,
-        ),
+def test_list_agents_ascending(server: SyncServer, default_user):
+    # Create two agents with known names and strictly increasing creation times
+    base_time = datetime.now(timezone.utc)
+    server.agent_manager.create_many_agents(
+        [
+            CreateAgent(
+                name=name,
+                llm_config=GPT4_LLM_CONFIG,
+                embedding_config=OPENAI_EMBEDDING_CONFIG,
+                memory_blocks=[],
+                include_base_tools=False,
+                created_at=base_time + timedelta(seconds=i),
+            )
+            for i, name in enumerate(["agent_oldest", "agent_newest"])
+        ],
         actor=default_user,
     )
 
     agents = server.agent_manager.list_agents(actor=default_user, ascending=True)
     names = [agent.name for agent in agents]
-    assert names.index("agent_oldest") < names.index("agent_newest")
+    _assert_order(names, "agent_oldest", "agent_newest")
 
 
 def test_list_agents_descending(server: SyncServer, default_user):
-    # Create two agents with known names
-    agent1 = server.agent_manager.create_agent(
-        agent_create=CreateAgent(
-            name="agent_oldest",
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
-            memory_blocks=[],
-            include_base_tools=False,
-        ),
-        actor=default_user,
-    )
-
-    if USING_SQLITE:
-        time.sleep(CREATE_DELAY_SQLITE)
-
-    agent2 = server.agent_manager.create_agent(
-        agent_create=CreateAgent(
-            name="agent_newest",
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
-            memory_blocks=[],
-            include_base_tools=False,
-        ),
+    # Create two agents with known names and strictly increasing creation times
+    base_time = datetime.now(timezone.utc)
+    server.agent_manager.create_many_agents(
+        [
+            CreateAgent(
+                name=name,
+                llm_config=GPT4_LLM_CONFIG,
+                embedding_config=OPENAI_EMBEDDING_CONFIG,
+                memory_blocks=[],
+                include_base_tools=False,
+                created_at=base_time + timedelta(seconds=i),
+            )
+            for i, name in enumerate(["agent_oldest", "agent_newest"])
+        ],
         actor=default_user,
     )
 
     agents = server.agent_manager.list_agents(actor=default_user, ascending=False)
     names = [agent.name for agent in agents]
-    assert names.index("agent_newest") < names.index("agent_oldest")
+    _assert_order(names, "agent_newest", "agent_oldest")
 
 
 def test_list_agents_ordering_and_pagination(server: SyncServer, default_user):
     names = ["alpha_agent", "beta_agent", "gamma_agent"]
-    created_agents = []
 
     # Create agents in known order
-    for name in names:
-        agent = server.agent_manager.create_agent(
-            agent_create=CreateAgent(
+    base_time = datetime.now(timezone.utc)
+    created_agents = server.agent_manager.create_many_agents(
+        [
+            CreateAgent(
                 name=name,
                 memory_blocks=[],
-                llm_config=LLMConfig.default_config("gpt-4"),
-                embedding_config=EmbeddingConfig.default_config(provider="openai"),
+                llm_config=GPT4_LLM_CONFIG,
+                embedding_config=OPENAI_EMBEDDING_CONFIG,
                 include_base_tools=False,
-            ),
-            actor=default_user,
-        )
-        created_agents.append(agent)
-        if USING_SQLITE:
-            time.sleep(CREATE_DELAY_SQLITE)
+                created_at=base_time + timedelta(seconds=i),
+            )
+            for i, name in enumerate(names)
+        ],
+        actor=default_user,
+    )
 
     agent_ids = {agent.name: agent.id for agent in created_agents}
 
     # Ascending (oldest to newest)
     agents_asc = server.agent_manager.list_agents(actor=default_user, ascending=True)
     asc_names = [agent.name for agent in agents_asc]
-    assert asc_names.index("alpha_agent") < asc_names.index("beta_agent") < asc_names.index("gamma_agent")
+    _assert_order(asc_names, "alpha_agent", "beta_agent", "gamma_agent")
 
     # Descending (newest to oldest)
     agents_desc = server.agent_manager.list_agents(actor=default_user, ascending=False)
     desc_names = [agent.name for agent in agents_desc]
-    assert desc_names.index("gamma_agent") < desc_names.index("beta_agent") < desc_names.index("alpha_agent")
+    _assert_order(desc_names, "gamma_agent", "beta_agent", "alpha_agent")
 
     # After: Get agents after alpha_agent in ascending order (should exclude alpha)
     after_alpha = server.agent_manager.list_agents(actor=default_user, after=agent_ids["alpha_agent"], ascending=True)
@@ -975,6 +1209,23 @@ def test_list_agents_ordering_and_pagination(server: SyncServer, default_user):
     before_names_desc = [a.name for a in before_alpha_desc]
     assert before_names_desc == ["gamma_agent", "beta_agent"]
 
+    # Encoded cursors page the same way as raw agent ids, without looking the cursor agent up
+    agents_by_name = {agent.name: agent for agent in created_agents}
+    after_alpha_cursor = server.agent_manager.list_agents(
+        actor=default_user, after=encode_agent_cursor(agents_by_name["alpha_agent"]), ascending=True
+    )
+    assert [a.name for a in after_alpha_cursor] == ["beta_agent", "gamma_agent"]
+    before_alpha_cursor = server.agent_manager.list_agents(
+        actor=default_user, before=encode_agent_cursor(agents_by_name["alpha_agent"]), ascending=False
+    )
+    assert [a.name for a in before_alpha_cursor] == ["gamma_agent", "beta_agent"]
+
+    # Cursors that can't be decoded or point at no agent are rejected rather than ignored
+    with pytest.raises(ValueError):
+        server.agent_manager.list_agents(actor=default_user, after="not-a-cursor")
+    with pytest.raises(NoResultFound):
+        server.agent_manager.list_agents(actor=default_user, before="agent-00000000-0000-0000-0000-000000000000")
+
 
 # ======================================================================================================================
 # AgentManager Tests - Tools Relationship
@@ -983,33 +1234,23 @@ def test_list_agents_ordering_and_pagination(server: SyncServer, default_user):
 
 def test_attach_tool(server: SyncServer, sarah_agent, print_tool, default_user):
     """Test attaching a tool to an agent."""
-    # Attach the tool
-    server.agent_manager.attach_tool(agent_id=sarah_agent.id, tool_id=print_tool.id, actor=default_user)
-
-    # Verify attachment through get_agent_by_id
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
+    # Attach the tool and verify it through the returned agent state
+    agent = server.agent_manager.attach_tool(agent_id=sarah_agent.id, tool_id=print_tool.id, actor=default_user)
     assert print_tool.id in [t.id for t in agent.tools]
 
     # Verify that attaching the same tool again doesn't cause duplication
-    server.agent_manager.attach_tool(agent_id=sarah_agent.id, tool_id=print_tool.id, actor=default_user)
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
+    agent = server.agent_manager.attach_tool(agent_id=sarah_agent.id, tool_id=print_tool.id, actor=default_user)
     assert len([t for t in agent.tools if t.id == print_tool.id]) == 1
 
 
 def test_detach_tool(server: SyncServer, sarah_agent, print_tool, default_user):
     """Test detaching a tool from an agent."""
-    # Attach the tool first
-    server.agent_manager.attach_tool(agent_id=sarah_agent.id, tool_id=print_tool.id, actor=default_user)
-
-    # Verify it's attached
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
+    # Attach the tool first and verify it's attached
+    agent = server.agent_manager.attach_tool(agent_id=sarah_agent.id, tool_id=print_tool.id, actor=default_user)
     assert print_tool.id in [t.id for t in agent.tools]
 
-    # Detach the tool
-    server.agent_manager.detach_tool(agent_id=sarah_agent.id, tool_id=print_tool.id, actor=default_user)
-
-    # Verify it's detached
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
+    # Detach the tool and verify it's detached
+    agent = server.agent_manager.detach_tool(agent_id=sarah_agent.id, tool_id=print_tool.id, actor=default_user)
     assert print_tool.id not in [t.id for t in agent.tools]
 
     # Verify that detaching an already detached tool doesn't cause issues
@@ -1059,16 +1300,12 @@ def test_list_attached_tools(server: SyncServer, sarah_agent, print_tool, other_
 
 def test_attach_source(server: SyncServer, sarah_agent, default_source, default_user):
     """Test attaching a source to an agent."""
-    # Attach the source
-    server.agent_manager.attach_source(agent_id=sarah_agent.id, source_id=default_source.id, actor=default_user)
-
-    # Verify attachment through get_agent_by_id
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
+    # Attach the source and verify it through the returned agent state
+    agent = server.agent_manager.attach_source(agent_id=sarah_agent.id, source_id=default_source.id, actor=default_user)
     assert default_source.id in [s.id for s in agent.sources]
 
     # Verify that attaching the same source again doesn't cause issues
-    server.agent_manager.attach_source(agent_id=sarah_agent.id, source_id=default_source.id, actor=default_user)
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
+    agent = server.agent_manager.attach_source(agent_id=sarah_agent.id, source_id=default_source.id, actor=default_user)
     assert len([s for s in agent.sources if s.id == default_source.id]) == 1
 
 
@@ -1089,21 +1326,18 @@ def test_list_attached_source_ids(server: SyncServer, sarah_agent, default_sourc
     assert default_source.id in source_ids
     assert other_source.id in source_ids
 
+    # The id-only listing matches without loading the sources
+    assert set(server.agent_manager.list_attached_source_ids(sarah_agent.id, actor=default_user)) == {default_source.id, other_source.id}
+
 
 def test_detach_source(server: SyncServer, sarah_agent, default_source, default_user):
     """Test detaching a source from an agent."""
-    # Attach source
-    server.agent_manager.attach_source(sarah_agent.id, default_source.id, actor=default_user)
-
-    # Verify it's attached
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
+    # Attach source and verify it's attached
+    agent = server.agent_manager.attach_source(sarah_agent.id, default_source.id, actor=default_user)
     assert default_source.id in [s.id for s in agent.sources]
 
-    # Detach source
-    server.agent_manager.detach_source(sarah_agent.id, default_source.id, actor=default_user)
-
-    # Verify it's detached
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
+    # Detach source and verify it's detached
+    agent = server.agent_manager.detach_source(sarah_agent.id, default_source.id, actor=default_user)
     assert default_source.id not in [s.id for s in agent.sources]
 
     # Verify that detaching an already detached source doesn't cause issues
@@ -1132,6 +1366,8 @@ def test_list_attached_source_ids_nonexistent_agent(server: SyncServer, default_
     """Test listing sources for a nonexistent agent."""
     with pytest.raises(NoResultFound):
         server.agent_manager.list_attached_sources(agent_id="nonexistent-agent-id", actor=default_user)
+    with pytest.raises(NoResultFound):
+        server.agent_manager.list_attached_source_ids(agent_id="nonexistent-agent-id", actor=default_user)
 
 
 def test_list_attached_agents(server: SyncServer, sarah_agent, charles_agent, default_source, default_user):
@@ -1139,6 +1375,7 @@ def test_list_attached_agents(server: SyncServer, sarah_agent, charles_agent, de
     # Initially should have no attached agents
     attached_agents = server.source_manager.list_attached_agents(source_id=default_source.id, actor=default_user)
     assert len(attached_agents) == 0
+    assert server.source_manager.list_attached_agent_ids(source_id=default_source.id, actor=default_user) == []
 
     # Attach source to first agent
     server.agent_manager.attach_source(agent_id=sarah_agent.id, source_id=default_source.id, actor=default_user)
@@ -1165,12 +1402,15 @@ def test_list_attached_agents(server: SyncServer, sarah_agent, charles_agent, de
     attached_agents = server.source_manager.list_attached_agents(source_id=default_source.id, actor=default_user)
     assert len(attached_agents) == 1
     assert charles_agent.id in [a.id for a in attached_agents]
+    assert server.source_manager.list_attached_agent_ids(source_id=default_source.id, actor=default_user) == [charles_agent.id]
 
 
 def test_list_attached_agents_nonexistent_source(server: SyncServer, default_user):
     """Test listing agents for a nonexistent source."""
     with pytest.raises(NoResultFound):
         server.source_manager.list_attached_agents(source_id="nonexistent-source-id", actor=default_user)
+    with pytest.raises(NoResultFound):
+        server.source_manager.list_attached_agent_ids(source_id="nonexistent-source-id", actor=default_user)
 
 
 # ======================================================================================================================
@@ -1283,32 +1523,20 @@ def test_list_agents_by_tags_with_other_filters(server: SyncServer, sarah_agent,
 
 def test_list_agents_by_tags_pagination(server: SyncServer, default_user, default_organization):
     """Test pagination when listing agents by tags."""
-    # Create first agent
-    agent1 = server.agent_manager.create_agent(
-        agent_create=CreateAgent(
-            name="agent1",
-            tags=["pagination_test", "tag1"],
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
-            memory_blocks=[],
-            include_base_tools=False,
-        ),
-        actor=default_user,
-    )
-
-    if USING_SQLITE:
-        time.sleep(CREATE_DELAY_SQLITE)  # Ensure distinct created_at timestamps
-
-    # Create second agent
-    agent2 = server.agent_manager.create_agent(
-        agent_create=CreateAgent(
-            name="agent2",
-            tags=["pagination_test", "tag2"],
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
-            memory_blocks=[],
-            include_base_tools=False,
-        ),
+    base_time = datetime.now(timezone.utc)
+    agent1, agent2 = server.agent_manager.create_many_agents(
+        [
+            CreateAgent(
+                name=f"agent{i + 1}",
+                tags=["pagination_test", f"tag{i + 1}"],
+                llm_config=GPT4_LLM_CONFIG,
+                embedding_config=OPENAI_EMBEDDING_CONFIG,
+                memory_blocks=[],
+                include_base_tools=False,
+                created_at=base_time + timedelta(seconds=i),
+            )
+            for i in range(2)
+        ],
         actor=default_user,
     )
 
@@ -1340,40 +1568,27 @@ def test_list_agents_by_tags_pagination(server: SyncServer, default_user, defaul
 
 def test_list_agents_query_text_pagination(server: SyncServer, default_user, default_organization):
     """Test listing agents with query text filtering and pagination."""
-    # Create test agents with specific names and descriptions
-    agent1 = server.agent_manager.create_agent(
-        agent_create=CreateAgent(
-            name="Search Agent One",
-            memory_blocks=[],
-            description="This is a search agent for testing",
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
-            include_base_tools=False,
-        ),
-        actor=default_user,
-    )
-
-    agent2 = server.agent_manager.create_agent(
-        agent_create=CreateAgent(
-            name="Search Agent Two",
-            memory_blocks=[],
-            description="Another search agent for testing",
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
-            include_base_tools=False,
-        ),
-        actor=default_user,
-    )
-
-    agent3 = server.agent_manager.create_agent(
-        agent_create=CreateAgent(
-            name="Different Agent",
-            memory_blocks=[],
-            description="This is a different agent",
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
-            include_base_tools=False,
-        ),
+    # Create test agents with specific names and descriptions, in a known creation order
+    base_time = datetime.now(timezone.utc)
+    agent1, agent2, agent3 = server.agent_manager.create_many_agents(
+        [
+            CreateAgent(
+                name=name,
+                memory_blocks=[],
+                description=description,
+                llm_config=GPT4_LLM_CONFIG,
+                embedding_config=OPENAI_EMBEDDING_CONFIG,
+                include_base_tools=False,
+                created_at=base_time + timedelta(seconds=i),
+            )
+            for i, (name, description) in enumerate(
+                [
+                    ("Search Agent One", "This is a search agent for testing"),
+                    ("Search Agent Two", "Another search agent for testing"),
+                    ("Different Agent", "This is a different agent"),
+                ]
+            )
+        ],
         actor=default_user,
     )
 
@@ -1414,6 +1629,12 @@ def test_list_agents_query_text_pagination(server: SyncServer, default_user, def
     assert len(all_ids) == 2
     assert all_ids == {agent1.id, agent2.id}
 
+    # Paging from an encoded cursor matches paging from the raw agent id
+    cursor_page = server.agent_manager.list_agents(
+        actor=default_user, query_text="search agent", after=encode_agent_cursor(first_page[0]), limit=1
+    )
+    assert [agent.id for agent in cursor_page] == [second_page[0].id]
+
 
 # ======================================================================================================================
 # AgentManager Tests - Messages Relationship
@@ -1426,8 +1647,7 @@ def test_reset_messages_no_messages(server: SyncServer, sarah_agent, default_use
     does not fail and clears out message_ids if somehow it's non-empty.
     """
     # Force a weird scenario: Suppose the message_ids field was set non-empty (without actual messages).
-    server.agent_manager.update_agent(sarah_agent.id, UpdateAgent(message_ids=["ghost-message-id"]), actor=default_user)
-    updated_agent = server.agent_manager.get_agent_by_id(sarah_agent.id, default_user)
+    updated_agent = server.agent_manager.update_agent(sarah_agent.id, UpdateAgent(message_ids=["ghost-message-id"]), actor=default_user)
     assert updated_agent.message_ids == ["ghost-message-id"]
 
     # Reset messages
@@ -1443,8 +1663,7 @@ def test_reset_messages_default_messages(server: SyncServer, sarah_agent, defaul
     does not fail and clears out message_ids if somehow it's non-empty.
     """
     # Force a weird scenario: Suppose the message_ids field was set non-empty (without actual messages).
-    server.agent_manager.update_agent(sarah_agent.id, UpdateAgent(message_ids=["ghost-message-id"]), actor=default_user)
-    updated_agent = server.agent_manager.get_agent_by_id(sarah_agent.id, default_user)
+    updated_agent = server.agent_manager.update_agent(sarah_agent.id, UpdateAgent(message_ids=["ghost-message-id"]), actor=default_user)
     assert updated_agent.message_ids == ["ghost-message-id"]
 
     # Reset messages
@@ -1459,23 +1678,22 @@ def test_reset_messages_with_existing_messages(server: SyncServer, sarah_agent,
     Test that resetting messages on an agent with actual messages
     deletes them from the database and clears message_ids.
     """
-    # 1. Create multiple messages for the agent
-    msg1 = server.message_manager.create_message(
-        PydanticMessage(
-            agent_id=sarah_agent.id,
-            organization_id=default_user.organization_id,
-            role="user",
-            content=[TextContent(text="Hello, Sarah!")],
-        ),
-        actor=default_user,
-    )
-    msg2 = server.message_manager.create_message(
-        PydanticMessage(
-            agent_id=sarah_agent.id,
-            organization_id=default_user.organization_id,
-            role="assistant",
-            content=[TextContent(text="Hello, user!")],
-        ),
+    # 1. Create multiple messages for the agent in one batch
+    server.message_manager.create_many_messages(
+        [
+            PydanticMessage(
+                agent_id=sarah_agent.id,
+                organization_id=default_user.organization_id,
+                role="user",
+                content=[TextContent(text="Hello, Sarah!")],
+            ),
+            PydanticMessage(
+                agent_id=sarah_agent.id,
+                organization_id=default_user.organization_id,
+                role="assistant",
+                content=[TextContent(text="Hello, user!")],
+            ),
+        ],
         actor=default_user,
     )
 
@@ -1533,37 +1751,6 @@ def test_modify_letta_message(server: SyncServer, sarah_agent, default_user):
     user_message = [msg for msg in letta_messages if msg.message_type == "user_message"][0]
     reasoning_message = [msg for msg in letta_messages if msg.message_type == "reasoning_message"][0]
 
-    # user message
-    update_user_message = UpdateUserMessage(content="Hello, Sarah!")
-    original_user_message = server.message_manager.get_message_by_id(message_id=user_message.id, actor=default_user)
-    assert original_user_message.content[0].text != update_user_message.content
-    server.message_manager.update_message_by_letta_message(
-        message_id=user_message.id, letta_message_update=update_user_message, actor=default_user
-    )
-    updated_user_message = server.message_manager.get_message_by_id(message_id=user_message.id, actor=default_user)
-    assert updated_user_message.content[0].text == update_user_message.content
-
-    # system message
-    update_system_message = UpdateSystemMessage(content="You are a friendly assistant!")
-    original_system_message = server.message_manager.get_message_by_id(message_id=system_message.id, actor=default_user)
-    assert original_system_message.content[0].text != update_system_message.content
-    server.message_manager.update_message_by_letta_message(
-        message_id=system_message.id, letta_message_update=update_system_message, actor=default_user
-    )
-    updated_system_message = server.message_manager.get_message_by_id(message_id=system_message.id, actor=default_user)
-    assert updated_system_message.content[0].text == update_system_message.content
-
-    # reasoning message
-    update_reasoning_message = UpdateReasoningMessage(reasoning="I am thinking")
-    original_reasoning_message = server.message_manager.get_message_by_id(message_id=reasoning_message.id, actor=default_user)
-    assert original_reasoning_message.content[0].text != update_reasoning_message.reasoning
-    server.message_manager.update_message_by_letta_message(
-        message_id=reasoning_message.id, letta_message_update=update_reasoning_message, actor=default_user
-    )
-    updated_reasoning_message = server.message_manager.get_message_by_id(message_id=reasoning_message.id, actor=default_user)
-    assert updated_reasoning_message.content[0].text == update_reasoning_message.reasoning
-
-    # assistant message
     def parse_send_message(tool_call):
         import json
 
@@ -1571,22 +1758,79 @@ def test_modify_letta_message(server: SyncServer, sarah_agent, default_user):
         arguments = json.loads(function_call.arguments)
         return arguments["message"]
 
+    update_user_message = UpdateUserMessage(content="Hello, Sarah!")
+    update_system_message = UpdateSystemMessage(content="You are a friendly assistant!")
+    update_reasoning_message = UpdateReasoningMessage(reasoning="I am thinking")
     update_assistant_message = UpdateAssistantMessage(content="I am an agent!")
-    original_assistant_message = server.message_manager.get_message_by_id(message_id=assistant_message.id, actor=default_user)
-    print("ORIGINAL", original_assistant_message.tool_calls)
-    print("MESSAGE", parse_send_message(original_assistant_message.tool_calls[0]))
-    assert parse_send_message(original_assistant_message.tool_calls[0]) != update_assistant_message.content
+
+    message_ids = [user_message.id, system_message.id, reasoning_message.id, assistant_message.id]
+    original_user, original_system, original_reasoning, original_assistant = server.message_manager.get_messages_by_ids(
+        message_ids=message_ids, actor=default_user
+    )
+    assert original_user.content[0].text != update_user_message.content
+    assert original_system.content[0].text != update_system_message.content
+    assert original_reasoning.content[0].text != update_reasoning_message.reasoning
+    assert parse_send_message(original_assistant.tool_calls[0]) != update_assistant_message.content
+
+    # Apply all four updates with a single call; the reasoning and assistant updates may target the same message
+    server.message_manager.update_messages_by_letta_message(
+        [
+            (user_message.id, update_user_message),
+            (system_message.id, update_system_message),
+            (reasoning_message.id, update_reasoning_message),
+            (assistant_message.id, update_assistant_message),
+        ],
+        actor=default_user,
+    )
+
+    updated_user, updated_system, updated_reasoning, updated_assistant = server.message_manager.get_messages_by_ids(
+        message_ids=message_ids, actor=default_user
+    )
+    assert updated_user.content[0].text == update_user_message.content
+    assert updated_system.content[0].text == update_system_message.content
+    assert updated_reasoning.content[0].text == update_reasoning_message.reasoning
+    assert parse_send_message(updated_assistant.tool_calls[0]) == update_assistant_message.content
+
+    # The single-message form still works on its own
+    update_user_message = UpdateUserMessage(content="Hello again, Sarah!")
     server.message_manager.update_message_by_letta_message(
-        message_id=assistant_message.id, letta_message_update=update_assistant_message, actor=default_user
+        message_id=user_message.id, letta_message_update=update_user_message, actor=default_user
     )
-    updated_assistant_message = server.message_manager.get_message_by_id(message_id=assistant_message.id, actor=default_user)
-    print("UPDATED", updated_assistant_message.tool_calls)
-    print("MESSAGE", parse_send_message(updated_assistant_message.tool_calls[0]))
-    assert parse_send_message(updated_assistant_message.tool_calls[0]) == update_assistant_message.content
+    updated_user = server.message_manager.get_message_by_id(message_id=user_message.id, actor=default_user)
+    assert updated_user.content[0].text == update_user_message.content
 
     # TODO: tool calls/responses
 
 
+def test_update_messages_by_letta_message_batch(server: SyncServer, sarah_agent, default_user):
+    """Edits to the reasoning and the send_message call of the same message are both applied by one batch call."""
+    messages = server.message_manager.list_messages_for_agent(agent_id=sarah_agent.id, actor=default_user)
+    letta_messages = PydanticMessage.to_letta_messages_from_list(messages=messages)
+    reasoning_message = [msg for msg in letta_messages if msg.message_type == "reasoning_message"][0]
+    assistant_message = [msg for msg in letta_messages if msg.message_type == "assistant_message"][0]
+
+    updated = server.message_manager.update_messages_by_letta_message(
+        [
+            (reasoning_message.id, UpdateReasoningMessage(reasoning="Batched thought")),
+            (assistant_message.id, UpdateAssistantMessage(content="Batched reply")),
+        ],
+        actor=default_user,
+    )
+
+    assert [msg.message_type for msg in updated] == ["reasoning_message", "assistant_message"]
+    assert updated[0].reasoning == "Batched thought"
+    assert updated[1].content == "Batched reply"
+
+    # Both edits were persisted, including when they target the same underlying message
+    letta_messages = PydanticMessage.to_letta_messages_from_list(
+        messages=server.message_manager.get_messages_by_ids(message_ids=[reasoning_message.id, assistant_message.id], actor=default_user)
+    )
+    assert any(msg.message_type == "reasoning_message" and msg.reasoning == "Batched thought" for msg in letta_messages)
+    assert any(msg.message_type == "assistant_message" and msg.content == "Batched reply" for msg in letta_messages)
+
+    assert server.message_manager.update_messages_by_letta_message([], actor=default_user) == []
+
+
 # ======================================================================================================================
 # AgentManager Tests - Blocks Relationship
 # ======================================================================================================================
@@ -1595,16 +1839,15 @@ def test_modify_letta_message(server: SyncServer, sarah_agent, default_user):
 def test_attach_block(server: SyncServer, sarah_agent, default_block, default_user):
     """Test attaching a block to an agent."""
     # Attach block
-    server.agent_manager.attach_block(agent_id=sarah_agent.id, block_id=default_block.id, actor=default_user)
+    agent = server.agent_manager.attach_block(agent_id=sarah_agent.id, block_id=default_block.id, actor=default_user)
 
     # Verify attachment
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
+    assert server.agent_manager.has_block(sarah_agent.id, default_block.id, actor=default_user) is True
     assert len(agent.memory.blocks) == 1
     assert agent.memory.blocks[0].id == default_block.id
     assert agent.memory.blocks[0].label == default_block.label
 
 
-@pytest.mark.skipif(USING_SQLITE, reason="Test not applicable when using SQLite.")
 def test_attach_block_duplicate_label(server: SyncServer, sarah_agent, default_block, other_block, default_user):
     """Test attempting to attach a block with a duplicate label."""
     # Set up both blocks with same label
@@ -1615,9 +1858,20 @@ def test_attach_block_duplicate_label(server: SyncServer, sarah_agent, default_b
     server.agent_manager.attach_block(agent_id=sarah_agent.id, block_id=default_block.id, actor=default_user)
 
     # Attempt to attach second block with same label
-    with pytest.raises(IntegrityError):
+    with pytest.raises(UniqueConstraintViolationError):
         server.agent_manager.attach_block(agent_id=sarah_agent.id, block_id=other_block.id, actor=default_user)
 
+    # Attaching the same block twice is rejected the same way, and unknown blocks are still reported as missing
+    with pytest.raises(UniqueConstraintViolationError):
+        server.agent_manager.attach_block(agent_id=sarah_agent.id, block_id=default_block.id, actor=default_user)
+    with pytest.raises(NoResultFound):
+        server.agent_manager.attach_block(
+            agent_id=sarah_agent.id, block_id="block-00000000-0000-0000-0000-000000000000", actor=default_user
+        )
+    assert [block.id for block in server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user).memory.blocks] == [
+        default_block.id
+    ]
+
 
 def test_detach_block(server: SyncServer, sarah_agent, default_block, default_user):
     """Test detaching a block by ID."""
@@ -1625,10 +1879,10 @@ def test_detach_block(server: SyncServer, sarah_agent, default_block, default_us
     server.agent_manager.attach_block(agent_id=sarah_agent.id, block_id=default_block.id, actor=default_user)
 
     # Detach block
-    server.agent_manager.detach_block(agent_id=sarah_agent.id, block_id=default_block.id, actor=default_user)
+    agent = server.agent_manager.detach_block(agent_id=sarah_agent.id, block_id=default_block.id, actor=default_user)
 
     # Verify detachment
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
+    assert server.agent_manager.has_block(sarah_agent.id, default_block.id, actor=default_user) is False
     assert len(agent.memory.blocks) == 0
 
     # Check that block still exists
@@ -1652,17 +1906,16 @@ def test_update_block_label(server: SyncServer, sarah_agent, default_block, defa
     server.block_manager.update_block(default_block.id, BlockUpdate(label=new_label), actor=default_user)
 
     # Verify relationship is updated
-    agent = server.agent_manager.get_agent_by_id(sarah_agent.id, actor=default_user)
-    block = agent.memory.blocks[0]
+    block = server.agent_manager.get_block_on_agent(sarah_agent.id, default_block.id, actor=default_user)
     assert block.id == default_block.id
     assert block.label == new_label
+    assert server.agent_manager.get_block_with_label(sarah_agent.id, new_label, actor=default_user).id == default_block.id
 
 
 def test_update_block_label_multiple_agents(server: SyncServer, sarah_agent, charles_agent, default_block, default_user):
     """Test updating a block's label updates relationships for all agents."""
     # Attach block to both agents
-    server.agent_manager.attach_block(agent_id=sarah_agent.id, block_id=default_block.id, actor=default_user)
-    server.agent_manager.attach_block(agent_id=charles_agent.id, block_id=default_block.id, actor=default_user)
+    server.agent_manager.attach_block_to_agents([sarah_agent.id, charles_agent.id], default_block.id, actor=default_user)
 
     # Update block label
     new_label = "new_label"
@@ -1670,12 +1923,21 @@ def test_update_block_label_multiple_agents(server: SyncServer, sarah_agent, cha
 
     # Verify both relationships are updated
     for agent_id in [sarah_agent.id, charles_agent.id]:
-        agent = server.agent_manager.get_agent_by_id(agent_id, actor=default_user)
-        # Find our specific block by ID
-        block = next(b for b in agent.memory.blocks if b.id == default_block.id)
+        block = server.agent_manager.get_block_on_agent(agent_id, default_block.id, actor=default_user)
         assert block.label == new_label
 
 
+def test_attach_block_to_agents_is_atomic(server: SyncServer, sarah_agent, charles_agent, default_block, default_user):
+    """Test that a batch attach fails as a whole when one of the agents already has the block."""
+    server.agent_manager.attach_block(agent_id=sarah_agent.id, block_id=default_block.id, actor=default_user)
+
+    with pytest.raises(UniqueConstraintViolationError):
+        server.agent_manager.attach_block_to_agents([charles_agent.id, sarah_agent.id], default_block.id, actor=default_user)
+
+    charles = server.agent_manager.get_agent_by_id(charles_agent.id, actor=default_user)
+    assert default_block.id not in [b.id for b in charles.memory.blocks]
+
+
 def test_get_block_with_label(server: SyncServer, sarah_agent, default_block, default_user):
     """Test retrieving a block by its label."""
     # Attach block
@@ -1687,6 +1949,10 @@ def test_get_block_with_label(server: SyncServer, sarah_agent, default_block, de
     assert block.id == default_block.id
     assert block.label == default_block.label
 
+    # A label the agent doesn't have
+    with pytest.raises(NoResultFound):
+        server.agent_manager.get_block_with_label(agent_id=sarah_agent.id, block_label="nonexistent_label", actor=default_user)
+
 
 def test_refresh_memory(server: SyncServer, default_user):
     block = server.block_manager.create_or_update_block(
@@ -1700,8 +1966,8 @@ def test_refresh_memory(server: SyncServer, default_user):
     agent = server.agent_manager.create_agent(
         CreateAgent(
             name="test",
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
+            llm_config=GPT4_LLM_CONFIG,
+            embedding_config=OPENAI_EMBEDDING_CONFIG,
             include_base_tools=False,
         ),
         actor=default_user,
@@ -1817,10 +2083,8 @@ def test_agent_list_passages_filtering(server, default_user, sarah_agent, defaul
     assert len(date_filtered) == 5
 
 
-def test_agent_list_passages_vector_search(server, default_user, sarah_agent, default_source):
+def test_agent_list_passages_vector_search(server, default_user, sarah_agent, default_source, embed_model):
     """Test vector search functionality of agent passages"""
-    embed_model = embedding_model(DEFAULT_EMBEDDING_CONFIG)
-
     # Create passages with known embeddings
     passages = []
 
@@ -1833,11 +2097,12 @@ def test_agent_list_passages_vector_search(server, default_user, sarah_agent, de
 
     server.agent_manager.attach_source(agent_id=sarah_agent.id, source_id=default_source.id, actor=default_user)
 
-    for i, text in enumerate(test_passages):
-        embedding = embed_model.get_text_embedding(text)
+    # Embed all passages with a single request
+    embeddings = embed_model.get_text_embedding_batch(test_passages)
+    for i, (passage_text, embedding) in enumerate(zip(test_passages, embeddings)):
         if i % 2 == 0:
             passage = PydanticPassage(
-                text=text,
+                text=passage_text,
                 organization_id=default_user.organization_id,
                 agent_id=sarah_agent.id,
                 embedding_config=DEFAULT_EMBEDDING_CONFIG,
@@ -1845,14 +2110,14 @@ def test_agent_list_passages_vector_search(server, default_user, sarah_agent, de
             )
         else:
             passage = PydanticPassage(
-                text=text,
+                text=passage_text,
                 organization_id=default_user.organization_id,
                 source_id=default_source.id,
                 embedding_config=DEFAULT_EMBEDDING_CONFIG,
                 embedding=embedding,
             )
-        created_passage = server.passage_manager.create_passage(passage, default_user)
-        passages.append(created_passage)
+        passages.append(passage)
+    passages = server.passage_manager.create_many_passages(passages, default_user)
 
     # Query vector similar to "red" embedding
     query_key = "What's my favorite color?"
@@ -1906,6 +2171,7 @@ def test_list_source_passages_only(server: SyncServer, default_user, default_sou
 # ======================================================================================================================
 # Organization Manager Tests
 # ======================================================================================================================
+@pytest.mark.isolated
 def test_list_organizations(server: SyncServer):
     # Create a new org and confirm that it is created correctly
     org_name = "test"
@@ -1943,6 +2209,7 @@ def test_update_organization_privileged_tools(server: SyncServer):
     assert org.privileged_tools == True
 
 
+@pytest.mark.isolated
 def test_list_organizations_pagination(server: SyncServer):
     server.organization_manager.create_organization(pydantic_org=PydanticOrganization(name="a"))
     server.organization_manager.create_organization(pydantic_org=PydanticOrganization(name="b"))
@@ -2020,10 +2287,13 @@ def test_passage_get_by_id(server: SyncServer, agent_passage_fixture, source_pas
     assert retrieved.id == agent_passage_fixture.id
     assert retrieved.text == agent_passage_fixture.text
 
-    retrieved = server.passage_manager.get_passage_by_id(source_passage_fixture.id, actor=default_user)
-    assert retrieved is not None
-    assert retrieved.id == source_passage_fixture.id
-    assert retrieved.text == source_passage_fixture.text
+    res = server.passage_manager.get_passages_by_ids([agent_passage_fixture.id, source_passage_fixture.id], actor=default_user)
+    assert set(res) == {agent_passage_fixture.id, source_passage_fixture.id}
+    assert res[agent_passage_fixture.id].text == agent_passage_fixture.text
+    assert res[source_passage_fixture.id].text == source_passage_fixture.text
+
+    # Unknown IDs are simply absent from the result
+    assert server.passage_manager.get_passages_by_ids(["passage-00000000-0000-4000-8000-000000000000"], actor=default_user) == {}
 
 
 def test_passage_cascade_deletion(
@@ -2050,6 +2320,7 @@ def test_passage_cascade_deletion(
 # ======================================================================================================================
 # User Manager Tests
 # ======================================================================================================================
+@pytest.mark.isolated
 def test_list_users(server: SyncServer):
     # Create default organization
     org = server.organization_manager.create_default_organization()
@@ -2108,6 +2379,21 @@ def test_create_tool(server: SyncServer, print_tool, default_user, default_organ
     assert print_tool.tool_type == ToolType.CUSTOM
 
 
+def test_create_many_tools(server: SyncServer, default_user, default_organization, _default_tools):
+    tools = [_default_tools["print_tool"].model_copy(deep=True), _default_tools["other_tool"].model_copy(deep=True)]
+    tools[1].description = None
+
+    created = server.tool_manager.create_many_tools(tools, actor=default_user)
+    assert [tool.name for tool in created] == [tool.name for tool in tools]
+    assert all(tool.organization_id == default_organization.id for tool in created)
+    assert created[1].description == PRINT_OTHER_TOOL_JSON_SCHEMA.get("description")
+
+    # The caller's tools are left untouched
+    assert all(tool.organization_id is None for tool in tools)
+    assert tools[1].description is None
+
+
+@pytest.mark.skipif(not tool_settings.composio_api_key, reason="Missing composio key, skipping the Composio tool fetch.")
 def test_create_composio_tool(server: SyncServer, composio_github_star_tool, default_user, default_organization):
     # Assertions to ensure the created tool matches the expected values
     assert composio_github_star_tool.created_by_id == default_user.id
@@ -2290,14 +2576,19 @@ def test_delete_tool_by_id(server: SyncServer, print_tool, default_user):
     assert len(tools) == 0
 
 
-def test_upsert_base_tools(server: SyncServer, default_user):
+def test_upsert_base_tools(server: SyncServer, default_user, count_queries):
     tools = server.tool_manager.upsert_base_tools(actor=default_user)
-    expected_tool_names = sorted(set(BASE_TOOLS + BASE_MEMORY_TOOLS + MULTI_AGENT_TOOLS + BASE_SLEEPTIME_TOOLS))
-    assert sorted([t.name for t in tools]) == expected_tool_names
-
-    # Call it again to make sure it doesn't create duplicates
-    tools = server.tool_manager.upsert_base_tools(actor=default_user)
-    assert sorted([t.name for t in tools]) == expected_tool_names
+    expected_tool_names = set(BASE_TOOLS + BASE_MEMORY_TOOLS + MULTI_AGENT_TOOLS + BASE_SLEEPTIME_TOOLS)
+    assert len(tools) == len(expected_tool_names)
+    assert {t.name for t in tools} == expected_tool_names
+
+    # Call it again to make sure it doesn't create duplicates, and that unchanged tools aren't read or written one by one:
+    # the no-op re-upsert is one lookup of the existing tools plus the actor's organization, however many tools there are
+    with count_queries() as statements:
+        tools = server.tool_manager.upsert_base_tools(actor=default_user)
+    assert len(statements) <= 2
+    assert len(tools) == len(expected_tool_names)
+    assert {t.name for t in tools} == expected_tool_names
 
     # Confirm that the return tools have no source_code, but a json_schema
     for t in tools:
@@ -2399,6 +2690,13 @@ def test_message_size(server: SyncServer, hello_world_message_fixture, default_u
     empty_count = server.message_manager.size(actor=default_user, agent_id="non-existent", role=MessageRole.user)
     assert empty_count == 0
 
+    # Test batched per-agent counts
+    sizes = server.message_manager.sizes([base_message.agent_id, "non-existent"], actor=default_user)
+    assert sizes == {
+        base_message.agent_id: server.message_manager.size(actor=default_user, agent_id=base_message.agent_id),
+        "non-existent": 0,
+    }
+
 
 def create_test_messages(server: SyncServer, base_message: PydanticMessage, default_user) -> list[PydanticMessage]:
     """Helper function to create test messages for all tests"""
@@ -2470,13 +2768,18 @@ def test_message_listing_cursor(server: SyncServer, hello_world_message_fixture,
     assert middle_page_desc[-1].id == first_page[1].id
 
 
-def test_message_listing_filtering(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
+def test_message_listing_filtering(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent, count_queries):
     """Test filtering messages by agent ID"""
     create_test_messages(server, hello_world_message_fixture, default_user)
 
-    agent_results = server.message_manager.list_user_messages_for_agent(agent_id=sarah_agent.id, actor=default_user, limit=10)
+    with count_queries() as single_page_statements:
+        server.message_manager.list_user_messages_for_agent(agent_id=sarah_agent.id, actor=default_user, limit=1)
+    with count_queries() as statements:
+        agent_results = server.message_manager.list_user_messages_for_agent(agent_id=sarah_agent.id, actor=default_user, limit=10)
     assert len(agent_results) == 6  # login message + base message + 4 test messages
     assert all(msg.agent_id == hello_world_message_fixture.agent_id for msg in agent_results)
+    # Loading more messages must not issue more queries
+    assert len(statements) == len(single_page_statements)
 
 
 def test_message_listing_text_search(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
@@ -2502,7 +2805,7 @@ def test_message_listing_text_search(server: SyncServer, hello_world_message_fix
 
 
 def test_create_block(server: SyncServer, default_user):
-    block_manager = BlockManager()
+    block_manager = server.block_manager
     block_create = PydanticBlock(
         label="human",
         is_template=True,
@@ -2527,7 +2830,7 @@ def test_create_block(server: SyncServer, default_user):
 
 
 def test_get_blocks(server, default_user):
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # Create blocks to retrieve later
     block_manager.create_or_update_block(PydanticBlock(label="human", value="Block 1"), actor=default_user)
@@ -2547,29 +2850,17 @@ def test_get_blocks(server, default_user):
 
 
 def test_get_blocks_comprehensive(server, default_user, other_user_different_org):
-    def random_label(prefix="label"):
-        return f"{prefix}_{''.join(random.choices(string.ascii_lowercase, k=6))}"
-
-    def random_value():
-        return "".join(random.choices(string.ascii_letters + string.digits, k=12))
-
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # Create 10 blocks for default_user
-    default_user_blocks = []
-    for _ in range(10):
-        label = random_label("default")
-        value = random_value()
-        block_manager.create_or_update_block(PydanticBlock(label=label, value=value), actor=default_user)
-        default_user_blocks.append((label, value))
+    default_user_blocks = [(f"default_{i:06x}", f"v{i:012d}") for i in range(10)]
+    block_manager.create_many_blocks([PydanticBlock(label=label, value=value) for label, value in default_user_blocks], actor=default_user)
 
     # Create 3 blocks for other_user
-    other_user_blocks = []
-    for _ in range(3):
-        label = random_label("other")
-        value = random_value()
-        block_manager.create_or_update_block(PydanticBlock(label=label, value=value), actor=other_user_different_org)
-        other_user_blocks.append((label, value))
+    other_user_blocks = [(f"other_{i:06x}", f"v{i:012d}") for i in range(3)]
+    block_manager.create_many_blocks(
+        [PydanticBlock(label=label, value=value) for label, value in other_user_blocks], actor=other_user_different_org
+    )
 
     # Check default_user sees only their blocks
     retrieved_default_blocks = block_manager.get_blocks(actor=default_user)
@@ -2602,7 +2893,7 @@ def test_get_blocks_comprehensive(server, default_user, other_user_different_org
 
 
 def test_update_block(server: SyncServer, default_user):
-    block_manager = BlockManager()
+    block_manager = server.block_manager
     block = block_manager.create_or_update_block(PydanticBlock(label="persona", value="Original Content"), actor=default_user)
 
     # Update block's content
@@ -2618,7 +2909,7 @@ def test_update_block(server: SyncServer, default_user):
 
 
 def test_update_block_limit(server: SyncServer, default_user):
-    block_manager = BlockManager()
+    block_manager = server.block_manager
     block = block_manager.create_or_update_block(PydanticBlock(label="persona", value="Original Content"), actor=default_user)
 
     limit = len("Updated Content") * 2000
@@ -2640,7 +2931,7 @@ def test_update_block_limit(server: SyncServer, default_user):
 
 
 def test_update_block_limit_does_not_reset(server: SyncServer, default_user):
-    block_manager = BlockManager()
+    block_manager = server.block_manager
     new_content = "Updated Content" * 2000
     limit = len(new_content)
     block = block_manager.create_or_update_block(PydanticBlock(label="persona", value="Original Content", limit=limit), actor=default_user)
@@ -2655,7 +2946,7 @@ def test_update_block_limit_does_not_reset(server: SyncServer, default_user):
 
 
 def test_delete_block(server: SyncServer, default_user):
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # Create and delete a block
     block = block_manager.create_or_update_block(PydanticBlock(label="human", value="Sample content"), actor=default_user)
@@ -2711,13 +3002,26 @@ def test_get_agents_for_block(server: SyncServer, sarah_agent, charles_agent, de
 # ======================================================================================================================
 
 
+def create_checkpointed_block(server: SyncServer, label: str, values: List[str], actor) -> PydanticBlock:
+    """Helper that creates a block holding values[0], then sets and checkpoints each value in turn, so seq=i+1 holds values[i]"""
+    block_manager = server.block_manager
+    block = block_manager.create_or_update_block(PydanticBlock(label=label, value=values[0]), actor=actor)
+    block_manager.checkpoint_block(block_id=block.id, actor=actor)
+    for value in values[1:]:
+        block_update = PydanticBlock(**block.model_dump())
+        block_update.value = value
+        block_manager.create_or_update_block(block_update, actor=actor)
+        block_manager.checkpoint_block(block_id=block.id, actor=actor)
+    return block
+
+
 def test_checkpoint_creates_history(server: SyncServer, default_user):
     """
     Ensures that calling checkpoint_block creates a BlockHistory row and updates
     the block's current_history_entry_id appropriately.
     """
 
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # Create a block
     initial_value = "Initial block content"
@@ -2743,7 +3047,7 @@ def test_checkpoint_creates_history(server: SyncServer, default_user):
 
 
 def test_multiple_checkpoints(server: SyncServer, default_user):
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # Create a block
     block = block_manager.create_or_update_block(PydanticBlock(label="test_multi_checkpoint", value="v1"), actor=default_user)
@@ -2783,7 +3087,7 @@ def test_checkpoint_with_agent_id(server: SyncServer, default_user, sarah_agent)
     Ensures that if we pass agent_id to checkpoint_block, we get
     actor_type=LETTA_AGENT, actor_id=<agent.id> in BlockHistory.
     """
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # Create a block
     block = block_manager.create_or_update_block(PydanticBlock(label="test_agent_checkpoint", value="Agent content"), actor=default_user)
@@ -2803,7 +3107,7 @@ def test_checkpoint_with_no_state_change(server: SyncServer, default_user):
     If we call checkpoint_block twice without any edits,
     we expect two entries or only one, depending on your policy.
     """
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # Create block
     block = block_manager.create_or_update_block(PydanticBlock(label="test_no_change", value="original"), actor=default_user)
@@ -2818,8 +3122,9 @@ def test_checkpoint_with_no_state_change(server: SyncServer, default_user):
         assert len(all_hist) == 2
 
 
+@pytest.mark.usefixtures("clear_tables")
 def test_checkpoint_concurrency_stale(server: SyncServer, default_user):
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # create block
     block = block_manager.create_or_update_block(PydanticBlock(label="test_stale_checkpoint", value="hello"), actor=default_user)
@@ -2859,7 +3164,7 @@ def test_checkpoint_no_future_states(server: SyncServer, default_user):
     creating a new checkpoint does NOT delete anything.
     """
 
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # 1) Create block with "v1" and checkpoint => seq=1
     block_v1 = block_manager.create_or_update_block(PydanticBlock(label="no_future_test", value="v1"), actor=default_user)
@@ -2901,7 +3206,7 @@ def test_undo_checkpoint_block(server: SyncServer, default_user):
       2) Update block content and checkpoint -> sequence_number=2
       3) Undo -> should revert block to sequence_number=1's content
     """
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # 1) Create block
     initial_value = "Version 1 content"
@@ -2931,25 +3236,10 @@ def test_checkpoint_deletes_future_states_after_undo(server: SyncServer, default
     Verifies that once we've undone to an earlier checkpoint, creating a new
     checkpoint removes any leftover 'future' states that existed beyond that sequence.
     """
-    block_manager = BlockManager()
-
-    # 1) Create block
-    block_init = PydanticBlock(label="test_truncation", value="v1")
-    block_v1 = block_manager.create_or_update_block(block_init, actor=default_user)
-    # Checkpoint => seq=1
-    block_manager.checkpoint_block(block_id=block_v1.id, actor=default_user)
-
-    # 2) Update to "v2", checkpoint => seq=2
-    block_v2 = PydanticBlock(**block_v1.model_dump())
-    block_v2.value = "v2"
-    block_manager.create_or_update_block(block_v2, actor=default_user)
-    block_manager.checkpoint_block(block_id=block_v1.id, actor=default_user)
+    block_manager = server.block_manager
 
-    # 3) Update to "v3", checkpoint => seq=3
-    block_v3 = PydanticBlock(**block_v1.model_dump())
-    block_v3.value = "v3"
-    block_manager.create_or_update_block(block_v3, actor=default_user)
-    block_manager.checkpoint_block(block_id=block_v1.id, actor=default_user)
+    # 1-3) Create block and checkpoint "v1" => seq=1, "v2" => seq=2, "v3" => seq=3
+    block_v1 = create_checkpointed_block(server, "test_truncation", ["v1", "v2", "v3"], default_user)
 
     # We now have three states in history: seq=1 (v1), seq=2 (v2), seq=3 (v3).
 
@@ -2996,7 +3286,7 @@ def test_undo_no_history(server: SyncServer, default_user):
     If a block has never been checkpointed (no current_history_entry_id),
     undo_checkpoint_block should raise a ValueError.
     """
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # Create a block but don't checkpoint it
     block = block_manager.create_or_update_block(PydanticBlock(label="no_history_test", value="initial"), actor=default_user)
@@ -3011,7 +3301,7 @@ def test_undo_first_checkpoint(server: SyncServer, default_user):
     If the block is at the first checkpoint (sequence_number=1),
     undo should fail because there's no prior checkpoint.
     """
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # 1) Create the block
     block_data = PydanticBlock(label="first_checkpoint", value="Version1")
@@ -3030,25 +3320,10 @@ def test_undo_multiple_checkpoints(server: SyncServer, default_user):
     Tests multiple checkpoints in a row, then undo repeatedly
     from seq=3 -> seq=2 -> seq=1, verifying each revert.
     """
-    block_manager = BlockManager()
-
-    # Step 1: Create block
-    block_data = PydanticBlock(label="multi_checkpoint", value="v1")
-    block_v1 = block_manager.create_or_update_block(block_data, actor=default_user)
-    # checkpoint => seq=1
-    block_manager.checkpoint_block(block_id=block_v1.id, actor=default_user)
+    block_manager = server.block_manager
 
-    # Step 2: Update to v2, checkpoint => seq=2
-    block_data_v2 = PydanticBlock(**block_v1.model_dump())
-    block_data_v2.value = "v2"
-    block_manager.create_or_update_block(block_data_v2, actor=default_user)
-    block_manager.checkpoint_block(block_id=block_v1.id, actor=default_user)
-
-    # Step 3: Update to v3, checkpoint => seq=3
-    block_data_v3 = PydanticBlock(**block_v1.model_dump())
-    block_data_v3.value = "v3"
-    block_manager.create_or_update_block(block_data_v3, actor=default_user)
-    block_manager.checkpoint_block(block_id=block_v1.id, actor=default_user)
+    # Steps 1-3: Create block and checkpoint v1 => seq=1, v2 => seq=2, v3 => seq=3
+    block_v1 = create_checkpointed_block(server, "multi_checkpoint", ["v1", "v2", "v3"], default_user)
 
     # Now we have 3 seq: v1, v2, v3
     # Undo from seq=3 -> seq=2
@@ -3070,20 +3345,10 @@ def test_undo_concurrency_stale(server: SyncServer, default_user):
     one session undoes first -> block now seq=1, version increments,
     the other session tries to undo with stale data -> StaleDataError.
     """
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
-    # 1) create block
-    block_data = PydanticBlock(label="concurrency_undo", value="v1")
-    block_v1 = block_manager.create_or_update_block(block_data, actor=default_user)
-    # checkpoint => seq=1
-    block_manager.checkpoint_block(block_v1.id, actor=default_user)
-
-    # 2) update to v2
-    block_data_v2 = PydanticBlock(**block_v1.model_dump())
-    block_data_v2.value = "v2"
-    block_manager.create_or_update_block(block_data_v2, actor=default_user)
-    # checkpoint => seq=2
-    block_manager.checkpoint_block(block_v1.id, actor=default_user)
+    # 1-2) create block, checkpoint v1 => seq=1, update to v2 and checkpoint => seq=2
+    block_v1 = create_checkpointed_block(server, "concurrency_undo", ["v1", "v2"], default_user)
 
     # Now block is at seq=2
 
@@ -3120,23 +3385,10 @@ def test_redo_checkpoint_block(server: SyncServer, default_user):
     5) Redo once (seq=2 -> seq=3)
     """
 
-    block_manager = BlockManager()
-
-    # 1) Create block, set value='v1'; checkpoint => seq=1
-    block_v1 = block_manager.create_or_update_block(PydanticBlock(label="redo_test", value="v1"), actor=default_user)
-    block_manager.checkpoint_block(block_id=block_v1.id, actor=default_user)
+    block_manager = server.block_manager
 
-    # 2) Update to 'v2'; checkpoint => seq=2
-    block_v2 = PydanticBlock(**block_v1.model_dump())
-    block_v2.value = "v2"
-    block_manager.create_or_update_block(block_v2, actor=default_user)
-    block_manager.checkpoint_block(block_id=block_v1.id, actor=default_user)
-
-    # 3) Update to 'v3'; checkpoint => seq=3
-    block_v3 = PydanticBlock(**block_v1.model_dump())
-    block_v3.value = "v3"
-    block_manager.create_or_update_block(block_v3, actor=default_user)
-    block_manager.checkpoint_block(block_id=block_v1.id, actor=default_user)
+    # 1-3) Create block and checkpoint 'v1' => seq=1, 'v2' => seq=2, 'v3' => seq=3
+    block_v1 = create_checkpointed_block(server, "redo_test", ["v1", "v2", "v3"], default_user)
 
     # Undo from seq=3 -> seq=2
     undone_block = block_manager.undo_checkpoint_block(block_v1.id, actor=default_user)
@@ -3152,7 +3404,7 @@ def test_redo_no_history(server: SyncServer, default_user):
     If a block has no current_history_entry_id (never checkpointed),
     then redo_checkpoint_block should raise ValueError.
     """
-    block_manager = BlockManager()
+    block_manager = server.block_manager
 
     # Create block with no checkpoint
     block = block_manager.create_or_update_block(PydanticBlock(label="redo_no_history", value="v0"), actor=default_user)
@@ -3167,17 +3419,10 @@ def test_redo_at_highest_checkpoint(server: SyncServer, default_user):
     If the block is at the maximum sequence number, there's no higher checkpoint to move to.
     redo_checkpoint_block should raise ValueError.
     """
-    block_manager = BlockManager()
-
-    # 1) Create block => checkpoint => seq=1
-    b_init = block_manager.create_or_update_block(PydanticBlock(label="redo_highest", value="v1"), actor=default_user)
-    block_manager.checkpoint_block(b_init.id, actor=default_user)
+    block_manager = server.block_manager
 
-    # 2) Another edit => seq=2
-    b_next = PydanticBlock(**b_init.model_dump())
-    b_next.value = "v2"
-    block_manager.create_or_update_block(b_next, actor=default_user)
-    block_manager.checkpoint_block(b_init.id, actor=default_user)
+    # 1-2) Create block => checkpoint => seq=1, another edit => seq=2
+    b_init = create_checkpointed_block(server, "redo_highest", ["v1", "v2"], default_user)
 
     # We are at seq=2, which is the highest checkpoint.
     # Attempt redo => there's no seq=3
@@ -3191,29 +3436,10 @@ def test_redo_after_multiple_undo(server: SyncServer, default_user):
     2) Undo thrice => from seq=4 to seq=1
     3) Redo thrice => from seq=1 back to seq=4
     """
-    block_manager = BlockManager()
-
-    # Step 1: create initial block => seq=1
-    b_init = block_manager.create_or_update_block(PydanticBlock(label="redo_multi", value="v1"), actor=default_user)
-    block_manager.checkpoint_block(b_init.id, actor=default_user)
-
-    # seq=2
-    b_v2 = PydanticBlock(**b_init.model_dump())
-    b_v2.value = "v2"
-    block_manager.create_or_update_block(b_v2, actor=default_user)
-    block_manager.checkpoint_block(b_init.id, actor=default_user)
-
-    # seq=3
-    b_v3 = PydanticBlock(**b_init.model_dump())
-    b_v3.value = "v3"
-    block_manager.create_or_update_block(b_v3, actor=default_user)
-    block_manager.checkpoint_block(b_init.id, actor=default_user)
-
-    # seq=4
-    b_v4 = PydanticBlock(**b_init.model_dump())
-    b_v4.value = "v4"
-    block_manager.create_or_update_block(b_v4, actor=default_user)
-    block_manager.checkpoint_block(b_init.id, actor=default_user)
+    block_manager = server.block_manager
+
+    # Step 1: create initial block => seq=1, then v2..v4 => seq=2..4
+    b_init = create_checkpointed_block(server, "redo_multi", ["v1", "v2", "v3", "v4"], default_user)
 
     # We have 4 checkpoints: v1...v4. Current is seq=4.
 
@@ -3229,23 +3455,10 @@ def test_redo_after_multiple_undo(server: SyncServer, default_user):
 
 
 def test_redo_concurrency_stale(server: SyncServer, default_user):
-    block_manager = BlockManager()
-
-    # 1) Create block => checkpoint => seq=1
-    block = block_manager.create_or_update_block(PydanticBlock(label="redo_concurrency", value="v1"), actor=default_user)
-    block_manager.checkpoint_block(block.id, actor=default_user)
-
-    # 2) Another edit => checkpoint => seq=2
-    block_v2 = PydanticBlock(**block.model_dump())
-    block_v2.value = "v2"
-    block_manager.create_or_update_block(block_v2, actor=default_user)
-    block_manager.checkpoint_block(block.id, actor=default_user)
-
-    # 3) Another edit => checkpoint => seq=3
-    block_v3 = PydanticBlock(**block.model_dump())
-    block_v3.value = "v3"
-    block_manager.create_or_update_block(block_v3, actor=default_user)
-    block_manager.checkpoint_block(block.id, actor=default_user)
+    block_manager = server.block_manager
+
+    # 1-3) Create block => checkpoint => seq=1, then two more edits => seq=2, seq=3
+    block = create_checkpointed_block(server, "redo_concurrency", ["v1", "v2", "v3"], default_user)
     # Now the block is at seq=3 in the DB
 
     # 4) Undo from seq=3 -> seq=2 so that we have a known future state at seq=3
@@ -3401,8 +3614,8 @@ def test_get_set_agents_for_identities(server: SyncServer, sarah_agent, charles_
     agent_with_identity = server.create_agent(
         CreateAgent(
             memory_blocks=[],
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
+            llm_config=GPT4_LLM_CONFIG,
+            embedding_config=OPENAI_EMBEDDING_CONFIG,
             identity_ids=[identity.id],
             include_base_tools=False,
         ),
@@ -3411,8 +3624,8 @@ def test_get_set_agents_for_identities(server: SyncServer, sarah_agent, charles_
     agent_without_identity = server.create_agent(
         CreateAgent(
             memory_blocks=[],
-            llm_config=LLMConfig.default_config("gpt-4"),
-            embedding_config=EmbeddingConfig.default_config(provider="openai"),
+            llm_config=GPT4_LLM_CONFIG,
+            embedding_config=OPENAI_EMBEDDING_CONFIG,
             include_base_tools=False,
         ),
         actor=default_user,
@@ -3480,7 +3693,7 @@ def test_attach_detach_identity_from_block(server: SyncServer, default_block, de
 
 
 def test_get_set_blocks_for_identities(server: SyncServer, default_block, default_user):
-    block_manager = BlockManager()
+    block_manager = server.block_manager
     block_with_identity = block_manager.create_or_update_block(PydanticBlock(label="persona", value="Original Content"), actor=default_user)
     block_without_identity = block_manager.create_or_update_block(PydanticBlock(label="user", value="Original Content"), actor=default_user)
     identity = server.identity_manager.create_identity(
@@ -3675,6 +3888,9 @@ def test_list_sources(server: SyncServer, default_user):
     assert len(next_page) == 1
     assert next_page[0].name != paginated_sources[0].name
 
+    # Pages follow the same (created_at, id) order as the full listing
+    assert [source.id for source in paginated_sources + next_page] == [source.id for source in sources]
+
 
 def test_get_source_by_id(server: SyncServer, default_user):
     """Test retrieving a source by ID."""
@@ -3755,8 +3971,6 @@ def test_list_files(server: SyncServer, default_user, default_source):
         PydanticFileMetadata(file_name="File 1", file_path="/path/to/file1.txt", file_type="text/plain", source_id=default_source.id),
         actor=default_user,
     )
-    if USING_SQLITE:
-        time.sleep(CREATE_DELAY_SQLITE)
     server.source_manager.create_file(
         PydanticFileMetadata(file_name="File 2", file_path="/path/to/file2.txt", file_type="text/plain", source_id=default_source.id),
         actor=default_user,
@@ -3775,6 +3989,9 @@ def test_list_files(server: SyncServer, default_user, default_source):
     assert len(next_page) == 1
     assert next_page[0].file_name != paginated_files[0].file_name
 
+    # Pages follow the same (created_at, id) order as the full listing
+    assert [file.id for file in paginated_files + next_page] == [file.id for file in files]
+
 
 def test_delete_file(server: SyncServer, default_user, default_source):
     """Test deleting a file."""
@@ -3885,6 +4102,7 @@ def test_list_sandbox_configs(server: SyncServer, default_user):
     next_page = server.sandbox_config_manager.list_sandbox_configs(actor=default_user, after=paginated_configs[-1].id, limit=1)
     assert len(next_page) == 1
     assert next_page[0].id != paginated_configs[0].id
+    assert [config.id for config in paginated_configs + next_page] == [config.id for config in configs[:2]]
 
     # List configs using sandbox_type filter
     configs = server.sandbox_config_manager.list_sandbox_configs(actor=default_user, sandbox_type=SandboxType.E2B)
@@ -3957,6 +4175,7 @@ def test_list_sandbox_env_vars(server: SyncServer, sandbox_config_fixture, defau
     )
     assert len(next_page) == 1
     assert next_page[0].id != paginated_env_vars[0].id
+    assert [env_var.id for env_var in paginated_env_vars + next_page] == [env_var.id for env_var in env_vars[:2]]
 
 
 def test_get_sandbox_env_var_by_key(server: SyncServer, sandbox_env_var_fixture, default_user):
@@ -4757,8 +4976,8 @@ def test_list_tags(server: SyncServer, default_user, default_organization):
             agent_create=CreateAgent(
                 name="tag_agent_" + str(i),
                 memory_blocks=[],
-                llm_config=LLMConfig.default_config("gpt-4"),
-                embedding_config=EmbeddingConfig.default_config(provider="openai"),
+                llm_config=GPT4_LLM_CONFIG,
+                embedding_config=OPENAI_EMBEDDING_CONFIG,
                 tags=tags[i : i + 3],  # Each agent gets 3 consecutive tags
                 include_base_tools=False,
             ),